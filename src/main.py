@@ -6,14 +6,23 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
-from src.models.zone import Zone, Event
-from src.models.investment import Product, Goal, Plan, Projection, AssetSnapshot
+from src.models.zone import Zone, Event, ZoneMomentum
+from src.models.investment import Product, Goal, Plan, Projection, AssetSnapshot, LatestAssetSnapshot, HealthScore
+from src.models.llm_cache import LLMCacheEntry
+from src.models.job import Job
 from src.routes.user import user_bp
 from src.routes.zones import zones_bp
 from src.routes.investments import investments_bp
 from src.routes.ai_services import ai_services_bp
 from src.routes.portfolio import portfolio_bp
 from src.routes.dashboard import dashboard_bp
+from src.routes.jobs import jobs_bp
+from src.routes.admin import admin_bp
+from src.services.zone_search import init_zone_search
+from src.services.jobs import fail_interrupted_jobs
+from src.services.zone_momentum import init_zone_momentum
+from src.services.health_scores import refresh_health_scores
+from src.services.latest_snapshots import init_latest_snapshots
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
@@ -28,15 +37,29 @@ app.register_blueprint(investments_bp, url_prefix='/api')
 app.register_blueprint(ai_services_bp, url_prefix='/api')
 app.register_blueprint(portfolio_bp, url_prefix='/api')
 app.register_blueprint(dashboard_bp, url_prefix='/api')
+app.register_blueprint(jobs_bp, url_prefix='/api')
+app.register_blueprint(admin_bp, url_prefix='/api')
 
 # Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+# DATABASE_URL lets tools (e.g. tools/benchmark_ai_routes.py) run against a copy
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv(
+    'DATABASE_URL', f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 
 # Create all tables
 with app.app_context():
     db.create_all()
+    init_zone_search()
+    fail_interrupted_jobs()
+    init_zone_momentum()
+    init_latest_snapshots()
+
+@app.cli.command('refresh-health-scores')
+def refresh_health_scores_command():
+    """Recompute financial health scores for every user (run nightly)"""
+    print(f'Scored {refresh_health_scores()} users')
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
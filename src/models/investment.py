@@ -136,6 +136,9 @@ class Projection(db.Model):
 
 class AssetSnapshot(db.Model):
     __tablename__ = 'asset_snapshots'
+    __table_args__ = (
+        db.Index('ix_asset_snapshots_user_created', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -167,3 +170,67 @@ class AssetSnapshot(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+
+class LatestAssetSnapshot(db.Model):
+    __tablename__ = 'latest_asset_snapshot'
+    
+    # Copy of each user's most recent AssetSnapshot, kept in sync on flush
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    snapshot_id = db.Column(db.Integer, db.ForeignKey('asset_snapshots.id'), nullable=False)
+    savings = db.Column(db.Integer, default=0)
+    mf = db.Column(db.Integer, default=0)
+    stocks = db.Column(db.Integer, default=0)
+    gold = db.Column(db.Integer, default=0)
+    epf = db.Column(db.Integer, default=0)
+    real_estate = db.Column(db.Integer, default=0)
+    liabilities = db.Column(db.Integer, default=0)
+    net_worth = db.Column(db.Integer, default=0)
+    as_of_date = db.Column(db.Date)
+    created_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<LatestAssetSnapshot {self.user_id} - {self.net_worth}>'
+
+    def to_dict(self):
+        return {
+            'id': self.snapshot_id,
+            'user_id': self.user_id,
+            'savings': self.savings,
+            'mf': self.mf,
+            'stocks': self.stocks,
+            'gold': self.gold,
+            'epf': self.epf,
+            'real_estate': self.real_estate,
+            'liabilities': self.liabilities,
+            'net_worth': self.net_worth,
+            'as_of_date': self.as_of_date.isoformat() if self.as_of_date else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class HealthScore(db.Model):
+    __tablename__ = 'health_scores'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    score = db.Column(db.Integer, nullable=False)
+    rating = db.Column(db.String(20), nullable=False)
+    factors = db.Column(db.Text)  # JSON object of factor ratings
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<HealthScore {self.user_id} - {self.score}>'
+
+    def to_dict(self):
+        factors = {}
+        if self.factors:
+            try:
+                factors = json.loads(self.factors)
+            except:
+                factors = {}
+                
+        return {
+            'user_id': self.user_id,
+            'score': self.score,
+            'rating': self.rating,
+            'factors': factors,
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None
+        }
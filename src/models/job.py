@@ -0,0 +1,39 @@
+from flask_sqlalchemy import SQLAlchemy
+from src.models.user import db
+from datetime import datetime
+import json
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    kind = db.Column(db.String(50), nullable=False)  # zone_analysis, recommendations, smart_recommendations
+    status = db.Column(db.String(20), default='QUEUED', nullable=False)  # QUEUED, RUNNING, SUCCEEDED, FAILED
+    params = db.Column(db.Text)  # JSON encoded job input
+    result = db.Column(db.Text)  # JSON encoded job output
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<Job {self.kind} {self.id}>'
+
+    def to_dict(self):
+        result = None
+        if self.result:
+            try:
+                result = json.loads(self.result)
+            except:
+                result = None
+                
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'result': result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
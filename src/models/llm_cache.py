@@ -0,0 +1,16 @@
+from flask_sqlalchemy import SQLAlchemy
+from src.models.user import db
+from datetime import datetime
+
+class LLMCacheEntry(db.Model):
+    __tablename__ = 'llm_cache'
+
+    key = db.Column(db.String(64), primary_key=True)  # sha256 of model + messages + params
+    namespace = db.Column(db.String(50), nullable=False)  # e.g. zone_analysis
+    payload = db.Column(db.LargeBinary, nullable=False)  # zlib-compressed JSON response
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    last_accessed_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<LLMCacheEntry {self.namespace}:{self.key[:12]}>'
@@ -78,3 +78,15 @@ class Event(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+
+class ZoneMomentum(db.Model):
+    __tablename__ = 'zone_momentum'
+    
+    zone_id = db.Column(db.Integer, db.ForeignKey('zones.id'), primary_key=True)
+    # Sum of status-weighted event impacts, each scaled to the momentum epoch;
+    # multiply by the decay since the epoch to get the current score
+    weighted_impact = db.Column(db.Float, nullable=False, default=0.0, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ZoneMomentum {self.zone_id}>'
@@ -0,0 +1,137 @@
+from flask import Blueprint, request, jsonify
+from src.services.ingest import INGEST_BATCH_SIZE, ingest
+from src.services.health_scores import refresh_health_scores
+from src.services.llm_cache import cache_stats
+from src.services.llm_client import llm_client
+from src.services.llm_gateway import llm_single_flight
+from src.services.jobs import enqueue_job, job_accepted_response, job_handler, wants_async
+from datetime import datetime
+import hmac
+import os
+
+admin_bp = Blueprint('admin', __name__)
+
+INGEST_FORMATS = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson'
+}
+
+@admin_bp.route('/admin/ingest/<any(zones, events):table_name>', methods=['POST'])
+def ingest_rows(table_name):
+    """Bulk upsert zones or events from a streamed CSV or NDJSON body"""
+    try:
+        if not is_authorized():
+            return jsonify({
+                'success': False,
+                'error': 'Unauthorized'
+            }), 401
+        
+        fmt = request.args.get('format') or INGEST_FORMATS.get(request.mimetype)
+        if fmt not in ('csv', 'ndjson'):
+            return jsonify({
+                'success': False,
+                'error': 'Send text/csv or application/x-ndjson (or pass ?format=csv|ndjson)'
+            }), 415
+        
+        batch_size = request.args.get('batch_size', type=int) or INGEST_BATCH_SIZE
+        report = ingest(table_name, request.stream, fmt, batch_size)
+        
+        return jsonify({
+            'success': True,
+            'data': report
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@admin_bp.route('/admin/health-scores/refresh', methods=['POST'])
+def refresh_all_health_scores():
+    """Recompute and store financial health scores for every user"""
+    try:
+        if not is_authorized():
+            return jsonify({
+                'success': False,
+                'error': 'Unauthorized'
+            }), 401
+        
+        if wants_async():
+            job = enqueue_job('health_scores', {})
+            return job_accepted_response(job)
+        
+        return jsonify({
+            'success': True,
+            'data': build_health_scores({})
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@admin_bp.route('/admin/llm-cache', methods=['GET'])
+def get_llm_cache_stats():
+    """LLM response cache hit/miss counters and size"""
+    try:
+        if not is_authorized():
+            return jsonify({
+                'success': False,
+                'error': 'Unauthorized'
+            }), 401
+        
+        return jsonify({
+            'success': True,
+            'data': cache_stats()
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@admin_bp.route('/admin/llm-metrics', methods=['GET'])
+def get_llm_metrics():
+    """LLM client latency, queue, circuit breaker and request coalescing metrics"""
+    try:
+        if not is_authorized():
+            return jsonify({
+                'success': False,
+                'error': 'Unauthorized'
+            }), 401
+        
+        metrics = llm_client.metrics()
+        metrics['single_flight'] = llm_single_flight.stats()
+        
+        return jsonify({
+            'success': True,
+            'data': metrics
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def is_authorized():
+    """Check X-Admin-Token against ADMIN_TOKEN; admin endpoints stay closed while it is unset"""
+    admin_token = os.getenv('ADMIN_TOKEN')
+    if not admin_token:
+        return False
+    provided = request.headers.get('X-Admin-Token', '')
+    return hmac.compare_digest(provided.encode('utf-8'), admin_token.encode('utf-8'))
+
+@job_handler('health_scores')
+def build_health_scores(params):
+    """Batch health score refresh report"""
+    started_at = datetime.utcnow()
+    scored = refresh_health_scores()
+    return {
+        'scored': scored,
+        'duration_ms': round((datetime.utcnow() - started_at).total_seconds() * 1000, 1)
+    }
@@ -1,16 +1,29 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify
 from src.models.zone import Zone, Event
 from src.models.investment import Product
 from src.models.user import db
-import openai
+from src.services.spatial_index import zone_index
+from src.services.search_index import search_index
+from src.services.location_cache import LocationCell, location_cache
+from src.services.market_insights import market_insights
+from src.services.risk_scoring import assess_risk_batch
+from src.services.query_parser import PARSER_CONFIDENCE_THRESHOLD, query_parser
+from src.services.llm_gateway import chat_completion, llm_available
+from src.services.jobs import enqueue_job, job_accepted_response, job_handler, wants_async
 import os
 import json
 from datetime import datetime
 
 ai_services_bp = Blueprint('ai_services', __name__)
 
-# Set up OpenAI API key
-openai.api_key = os.getenv('OPENAI_API_KEY')
+# Mixed zone / event / product results returned by /ai/search
+SEARCH_RESULT_LIMIT = 20
+
+# Largest scenario list accepted by /ai/risk-assessment/batch
+RISK_BATCH_MAX_SCENARIOS = int(os.getenv('RISK_BATCH_MAX_SCENARIOS', 10000))
+
+# Market insights reflect recent events, so reuse them for a shorter time
+MARKET_INSIGHTS_CACHE_TTL = int(os.getenv('MARKET_INSIGHTS_CACHE_TTL', 60 * 60))
 
 @ai_services_bp.route('/ai/search', methods=['POST'])
 def ai_enhanced_search():
@@ -54,16 +67,24 @@ def location_based_analysis():
                 'error': 'Latitude and longitude are required'
             }), 400
         
-        # Find nearby zones
-        nearby_zones = find_nearby_zones(lat, lng, radius)
-        
-        # Get AI analysis for the location
-        location_analysis = get_location_investment_analysis(lat, lng, nearby_zones)
+        # Candidate zones are cached per geohash cell and radius bucket, then
+        # filtered by this request's exact point and radius
+        lat, lng, radius = float(lat), float(lng), max(float(radius), 0.0)
+        cell = LocationCell(lat, lng, radius)
+        nearby_zones = location_cache.nearby_zones(cell, lat, lng, radius, find_nearby_zones)
+        
+        # Get AI analysis for the location (shared by requests in the cell seeing the same zones)
+        location_analysis = location_cache.analysis(
+            cell,
+            tuple(zone['id'] for zone in nearby_zones[:3]),
+            lambda: analyze_location_cell(cell, nearby_zones)
+        )
         
         return jsonify({
             'success': True,
             'data': {
                 'location': {'latitude': lat, 'longitude': lng},
+                'cell': {'geohash': cell.geohash},
                 'nearby_zones': nearby_zones,
                 'analysis': location_analysis
             }
@@ -81,19 +102,14 @@ def smart_investment_recommendations():
     try:
         data = request.get_json()
         
-        user_profile = data.get('user_profile', {})
-        location_data = data.get('location_data', {})
-        market_conditions = data.get('market_conditions', {})
-        investment_goals = data.get('investment_goals', {})
-        
-        # Generate comprehensive recommendations
-        recommendations = generate_smart_recommendations(
-            user_profile, location_data, market_conditions, investment_goals
-        )
+        # Optionally run in the background and let the client poll /jobs/<id>
+        if wants_async():
+            job = enqueue_job('smart_recommendations', data)
+            return job_accepted_response(job)
         
         return jsonify({
             'success': True,
-            'data': recommendations
+            'data': build_smart_recommendations(data)
         })
     
     except Exception as e:
@@ -106,17 +122,18 @@ def smart_investment_recommendations():
 def get_market_insights():
     """Get AI-generated market insights and trends"""
     try:
-        # Get recent events and zone data
-        recent_events = Event.query.order_by(Event.created_at.desc()).limit(10).all()
-        top_zones = Zone.query.order_by(Zone.rank).limit(5).all()
-        
-        # Generate market insights
-        insights = generate_market_insights(recent_events, top_zones)
-        
-        return jsonify({
-            'success': True,
-            'data': insights
-        })
+        # Insights are regenerated in the background; requests read the latest snapshot
+        market_insights.ensure_started(current_app._get_current_object())
+        snapshot = market_insights.current()
+        if snapshot is None:
+            # Scheduler's first run still in progress: serve the rule-based version meanwhile
+            snapshot = market_insights.publish(build_market_insights(use_ai=False), only_if_empty=True)
+        
+        response = Response(snapshot.body, mimetype='application/json')
+        response.set_etag(snapshot.etag)
+        response.headers['X-Insights-Version'] = str(snapshot.version)
+        response.last_modified = snapshot.generated_at
+        return response.make_conditional(request)
     
     except Exception as e:
         return jsonify({
@@ -157,11 +174,76 @@ def assess_investment_risk():
             'error': str(e)
         }), 500
 
+@ai_services_bp.route('/ai/risk-assessment/batch', methods=['POST'])
+def assess_investment_risk_batch():
+    """Assess many investment scenarios in one vectorized pass"""
+    try:
+        data = request.get_json() or {}
+        scenarios = data.get('scenarios')
+        
+        if not isinstance(scenarios, list) or not all(isinstance(s, dict) for s in scenarios):
+            return jsonify({
+                'success': False,
+                'error': 'scenarios must be a list of risk-assessment requests'
+            }), 400
+        
+        if len(scenarios) > RISK_BATCH_MAX_SCENARIOS:
+            return jsonify({
+                'success': False,
+                'error': f'At most {RISK_BATCH_MAX_SCENARIOS} scenarios per batch'
+            }), 400
+        
+        for index, scenario in enumerate(scenarios):
+            error = risk_scenario_error(scenario)
+            if error:
+                return jsonify({
+                    'success': False,
+                    'error': f'scenarios[{index}]: {error}'
+                }), 400
+        
+        try:
+            assessments = assess_risk_batch(scenarios)
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'amount and time_horizon must be numbers'
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'data': assessments,
+            'count': len(assessments)
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def risk_scenario_error(scenario):
+    """Why a batch scenario can't be assessed, or None; amount and time_horizon are checked by the batch"""
+    if not isinstance(scenario.get('user_profile') or {}, dict):
+        return 'user_profile must be an object'
+    if not isinstance(scenario.get('investment_type', 'real_estate'), str):
+        return 'investment_type must be a string'
+    zone_id = scenario.get('zone_id')
+    if zone_id is not None and (isinstance(zone_id, bool) or not isinstance(zone_id, (int, str))):
+        return 'zone_id must be an integer'
+    return None
+
 def interpret_search_query(query):
     """Use AI to interpret natural language search queries"""
     try:
-        if not openai.api_key:
-            return fallback_search_interpretation(query)
+        # Most queries are fully explained by the local parser; only ask the LLM for the rest
+        parsed_query, confidence = query_parser.parse(query)
+        if confidence >= PARSER_CONFIDENCE_THRESHOLD or not llm_available():
+            return {
+                'interpreted_query': parsed_query,
+                'results': execute_interpreted_search(parsed_query, query),
+                'generated_by': 'Local Parser',
+                'confidence': confidence
+            }
         
         prompt = f"""
         Interpret this real estate investment search query: "{query}"
@@ -177,25 +259,24 @@ def interpret_search_query(query):
         If not mentioned, use null for that field.
         """
         
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        ai_response = chat_completion(
+            [
                 {"role": "system", "content": "You are a financial search assistant. Return only valid JSON."},
                 {"role": "user", "content": prompt}
             ],
+            namespace='search_interpretation',
             max_tokens=300,
             temperature=0.3
         )
         
         # Parse AI response
-        ai_response = response.choices[0].message.content
         try:
             parsed_query = json.loads(ai_response)
         except:
             parsed_query = fallback_search_interpretation(query)
         
         # Search based on interpreted query
-        search_results = execute_interpreted_search(parsed_query)
+        search_results = execute_interpreted_search(parsed_query, query)
         
         return {
             'interpreted_query': parsed_query,
@@ -208,105 +289,97 @@ def interpret_search_query(query):
 
 def fallback_search_interpretation(query):
     """Fallback search interpretation when AI is not available"""
-    # Simple keyword-based interpretation
-    query_lower = query.lower()
-    
-    # Extract location
-    location = None
-    cities = ['mumbai', 'delhi', 'bangalore', 'pune', 'hyderabad', 'chennai', 'kolkata', 'ahmedabad']
-    for city in cities:
-        if city in query_lower:
-            location = city.title()
-            break
-    
-    # Extract investment type
-    investment_type = 'real_estate'  # default
-    if any(word in query_lower for word in ['stock', 'equity', 'share']):
-        investment_type = 'stocks'
-    elif any(word in query_lower for word in ['mutual fund', 'sip', 'mf']):
-        investment_type = 'sip'
+    # Rule-based interpretation over known locations, budgets, horizons and risk words
+    parsed_query, confidence = query_parser.parse(query)
+    if not parsed_query['investment_type']:
+        parsed_query['investment_type'] = 'real_estate'  # default
     
     # Search based on interpretation
-    search_results = execute_interpreted_search({
-        'location': location,
-        'investment_type': investment_type,
-        'budget_range': None,
-        'time_horizon': None,
-        'risk_preference': None
-    })
+    search_results = execute_interpreted_search(parsed_query, query)
     
     return {
-        'interpreted_query': {
-            'location': location,
-            'investment_type': investment_type,
-            'budget_range': None,
-            'time_horizon': None,
-            'risk_preference': None
-        },
+        'interpreted_query': parsed_query,
         'results': search_results,
-        'generated_by': 'Fallback Algorithm'
+        'generated_by': 'Fallback Algorithm',
+        'confidence': confidence
     }
 
-def execute_interpreted_search(parsed_query):
+def execute_interpreted_search(parsed_query, query=None):
     """Execute search based on interpreted query"""
     results = []
     
-    # Search zones based on location
-    if parsed_query.get('location'):
-        zones = Zone.query.filter(
-            db.or_(
-                Zone.city.ilike(f"%{parsed_query['location']}%"),
-                Zone.name.ilike(f"%{parsed_query['location']}%")
-            )
-        ).all()
-        
-        for zone in zones:
-            zone_data = zone.to_dict()
-            zone_data['match_type'] = 'location'
-            zone_data['relevance_score'] = 0.9
-            results.append(zone_data)
-    
-    # If no location-specific results, return top zones
+    # BM25 over zones, events and products; the query text adds terms the interpretation dropped
+    location = parsed_query.get('location')
+    investment_type = parsed_query.get('investment_type')
+    search_text = ' '.join(part for part in (location, investment_type, query) if part)
+    hits = search_index.search(search_text, k=SEARCH_RESULT_LIMIT)
+    
+    ids_by_type = {}
+    for doc_type, doc_id, _ in hits:
+        ids_by_type.setdefault(doc_type, []).append(doc_id)
+    records = {}
+    for doc_type, model in (('zone', Zone), ('event', Event), ('product', Product)):
+        if doc_type in ids_by_type:
+            for record in model.query.filter(model.id.in_(ids_by_type[doc_type])):
+                records[(doc_type, record.id)] = record
+    
+    location_lower = location.lower() if location else None
+    for doc_type, doc_id, score in hits:
+        record = records.get((doc_type, doc_id))
+        if record is None:
+            continue
+        result = record.to_dict()
+        result['result_type'] = doc_type
+        if doc_type == 'zone' and location_lower and location_lower in (
+            record.name.lower(), record.city.lower(), record.state.lower()
+        ):
+            result['match_type'] = 'location'
+        else:
+            result['match_type'] = 'keyword'
+        result['relevance_score'] = round(score, 4)
+        results.append(result)
+    
+    # If nothing matched, return top zones
     if not results:
         top_zones = Zone.query.order_by(Zone.rank).limit(5).all()
         for zone in top_zones:
             zone_data = zone.to_dict()
+            zone_data['result_type'] = 'zone'
             zone_data['match_type'] = 'general'
-            zone_data['relevance_score'] = 0.7
+            zone_data['relevance_score'] = 0.0
             results.append(zone_data)
     
     return results
 
+def analyze_location_cell(cell, nearby_zones):
+    """Analysis for a geohash cell, plus whether it is final (AI-generated or nothing nearby)"""
+    location_analysis = get_location_investment_analysis(round(cell.lat, 4), round(cell.lng, 4), nearby_zones)
+    return location_analysis, location_analysis['generated_by'] == 'AI' or not nearby_zones
+
 def find_nearby_zones(lat, lng, radius_km):
     """Find zones within a given radius of coordinates"""
-    # Simple distance calculation (for demo purposes)
-    # In production, use proper geospatial queries
-    
-    all_zones = Zone.query.all()
+    # Grid index narrows candidates to nearby cells, distances are haversine
+    matches = zone_index.query_radius(float(lat), float(lng), float(radius_km))
+    if not matches:
+        return []
+
+    zones_by_id = {zone.id: zone for zone in Zone.query.filter(Zone.id.in_([zone_id for zone_id, _ in matches]))}
+
     nearby_zones = []
-    
-    for zone in all_zones:
-        # Calculate approximate distance using Haversine formula (simplified)
-        lat_diff = abs(zone.lat - lat)
-        lng_diff = abs(zone.lng - lng)
-        
-        # Rough distance calculation (1 degree ≈ 111 km)
-        distance = ((lat_diff ** 2 + lng_diff ** 2) ** 0.5) * 111
-        
-        if distance <= radius_km:
-            zone_data = zone.to_dict()
-            zone_data['distance_km'] = round(distance, 2)
-            nearby_zones.append(zone_data)
-    
-    # Sort by distance
-    nearby_zones.sort(key=lambda x: x['distance_km'])
-    
+    for zone_id, distance in matches:
+        zone = zones_by_id.get(zone_id)
+        if zone is None:
+            continue
+        zone_data = zone.to_dict()
+        zone_data['distance_km'] = round(distance, 2)
+        nearby_zones.append(zone_data)
+
     return nearby_zones
 
 def get_location_investment_analysis(lat, lng, nearby_zones):
     """Get AI analysis for a specific location"""
     try:
-        if not openai.api_key or not nearby_zones:
+        if not llm_available() or not nearby_zones:
             return get_fallback_location_analysis(nearby_zones)
         
         zones_summary = []
@@ -326,18 +399,18 @@ def get_location_investment_analysis(lat, lng, nearby_zones):
         Keep response concise and practical.
         """
         
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        ai_text = chat_completion(
+            [
                 {"role": "system", "content": "You are a real estate investment analyst."},
                 {"role": "user", "content": prompt}
             ],
+            namespace='location_analysis',
             max_tokens=400,
             temperature=0.7
         )
         
         return {
-            'analysis': response.choices[0].message.content,
+            'analysis': ai_text,
             'generated_by': 'AI',
             'timestamp': datetime.utcnow().isoformat()
         }
@@ -372,10 +445,23 @@ def get_fallback_location_analysis(nearby_zones):
         'timestamp': datetime.utcnow().isoformat()
     }
 
+@job_handler('smart_recommendations')
+def build_smart_recommendations(data):
+    """Recommendations payload for an /ai/smart-recommendations request body"""
+    user_profile = data.get('user_profile', {})
+    location_data = data.get('location_data', {})
+    market_conditions = data.get('market_conditions', {})
+    investment_goals = data.get('investment_goals', {})
+    
+    # Generate comprehensive recommendations
+    return generate_smart_recommendations(
+        user_profile, location_data, market_conditions, investment_goals
+    )
+
 def generate_smart_recommendations(user_profile, location_data, market_conditions, investment_goals):
     """Generate comprehensive investment recommendations"""
     try:
-        if not openai.api_key:
+        if not llm_available():
             return get_fallback_smart_recommendations(user_profile, investment_goals)
         
         context = f"""
@@ -403,18 +489,18 @@ def generate_smart_recommendations(user_profile, location_data, market_condition
         Keep recommendations practical and actionable.
         """
         
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        ai_text = chat_completion(
+            [
                 {"role": "system", "content": "You are a comprehensive financial advisor providing personalized investment strategies."},
                 {"role": "user", "content": prompt}
             ],
+            namespace='smart_recommendations',
             max_tokens=600,
             temperature=0.7
         )
         
         return {
-            'recommendations': response.choices[0].message.content,
+            'recommendations': ai_text,
             'generated_by': 'AI',
             'timestamp': datetime.utcnow().isoformat()
         }
@@ -461,10 +547,20 @@ def get_fallback_smart_recommendations(user_profile, investment_goals):
         'timestamp': datetime.utcnow().isoformat()
     }
 
+@market_insights.builder
+def build_market_insights(use_ai=True):
+    """Market insights from the 10 latest events and top 5 zones"""
+    recent_events = Event.query.order_by(Event.created_at.desc()).limit(10).all()
+    top_zones = Zone.query.order_by(Zone.rank).limit(5).all()
+    
+    if not use_ai:
+        return get_fallback_market_insights(recent_events, top_zones)
+    return generate_market_insights(recent_events, top_zones)
+
 def generate_market_insights(recent_events, top_zones):
     """Generate market insights based on recent events and zone data"""
     try:
-        if not openai.api_key:
+        if not llm_available():
             return get_fallback_market_insights(recent_events, top_zones)
         
         events_summary = [f"{event.title} ({event.type})" for event in recent_events[:5]]
@@ -484,18 +580,19 @@ def generate_market_insights(recent_events, top_zones):
         Keep insights actionable and forward-looking.
         """
         
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        ai_text = chat_completion(
+            [
                 {"role": "system", "content": "You are a market analyst providing investment insights."},
                 {"role": "user", "content": prompt}
             ],
+            namespace='market_insights',
+            ttl_seconds=MARKET_INSIGHTS_CACHE_TTL,
             max_tokens=500,
             temperature=0.7
         )
         
         return {
-            'insights': response.choices[0].message.content,
+            'insights': ai_text,
             'generated_by': 'AI',
             'timestamp': datetime.utcnow().isoformat()
         }
@@ -1,17 +1,19 @@
-from flask import Blueprint, request, jsonify
-from src.models.investment import Product, Goal, Plan, Projection, AssetSnapshot
+from flask import Blueprint, Response, request, jsonify
+from src.models.investment import Product, Goal, Plan, Projection, AssetSnapshot, LatestAssetSnapshot, HealthScore
 from src.models.zone import Zone
 from src.models.user import User, db
-import openai
-import os
+from src.services.product_catalog import product_catalog
+from src.services.health_scores import get_fresh_health_score, store_health_scores
+from src.services.projections import (
+    DEFAULT_PATHS, MAX_PATH_MONTHS, build_plan_projection, clamp_paths, paths_within_limit
+)
+from src.services.llm_gateway import chat_completion, llm_available
+from src.services.jobs import enqueue_job, job_accepted_response, job_handler, wants_async
 import json
 from datetime import datetime
 
 investments_bp = Blueprint('investments', __name__)
 
-# Set up OpenAI API key
-openai.api_key = os.getenv('OPENAI_API_KEY')
-
 @investments_bp.route('/products', methods=['GET'])
 def get_products():
     """Get all investment products with optional filtering"""
@@ -19,21 +21,17 @@ def get_products():
         category = request.args.get('category')
         risk = request.args.get('risk')
         
-        query = Product.query
-        
-        if category:
-            query = query.filter(Product.category == category.upper())
-        if risk:
-            query = query.filter(Product.risk == risk.upper())
-        
-        products = query.all()
-        products_data = [product.to_dict() for product in products]
+        # Pre-rendered from the in-memory catalog snapshot
+        snapshot = product_catalog.current()
+        body, etag = snapshot.response_for(
+            category.upper() if category else None,
+            risk.upper() if risk else None
+        )
         
-        return jsonify({
-            'success': True,
-            'data': products_data,
-            'count': len(products_data)
-        })
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['X-Catalog-Version'] = snapshot.version
+        return response.make_conditional(request)
     
     except Exception as e:
         return jsonify({
@@ -47,24 +45,14 @@ def get_investment_recommendations():
     try:
         data = request.get_json()
         
-        # Extract user profile and goal data
-        user_profile = data.get('user_profile', {})
-        goal_data = data.get('goal_data', {})
-        zone_id = data.get('zone_id')
-        
-        # Get zone data if provided
-        zone_data = None
-        if zone_id:
-            zone = Zone.query.get(zone_id)
-            if zone:
-                zone_data = zone.to_dict()
-        
-        # Generate recommendations
-        recommendations = generate_portfolio_recommendations(user_profile, goal_data, zone_data)
+        # Optionally run in the background and let the client poll /jobs/<id>
+        if wants_async():
+            job = enqueue_job('recommendations', data)
+            return job_accepted_response(job)
         
         return jsonify({
             'success': True,
-            'data': recommendations
+            'data': build_investment_recommendations(data)
         })
     
     except Exception as e:
@@ -106,16 +94,30 @@ def create_goal():
 def get_user_goals(user_id):
     """Get all goals for a user"""
     try:
-        goals = Goal.query.filter_by(user_id=user_id).all()
-        goals_data = []
+        include = parse_include(GOAL_INCLUDES)
+        
+        # Plans counted in SQL, zone joined in the same query
+        plans_count = db.session.query(
+            Plan.goal_id.label('goal_id'),
+            db.func.count(Plan.id).label('plans_count')
+        ).group_by(Plan.goal_id).subquery()
+        
+        query = db.session.query(
+            Goal,
+            db.func.coalesce(plans_count.c.plans_count, 0)
+        ).outerjoin(plans_count, plans_count.c.goal_id == Goal.id
+        ).filter(Goal.user_id == user_id).order_by(Goal.id)
+        if 'zone' in include:
+            query = query.options(db.joinedload(Goal.zone))
         
-        for goal in goals:
+        goals_data = []
+        for goal, goal_plans_count in query:
             goal_dict = goal.to_dict()
             # Add zone information if available
-            if goal.zone:
+            if 'zone' in include and goal.zone:
                 goal_dict['zone'] = goal.zone.to_dict()
             # Add plans count
-            goal_dict['plans_count'] = len(goal.plans)
+            goal_dict['plans_count'] = goal_plans_count
             goals_data.append(goal_dict)
         
         return jsonify({
@@ -135,30 +137,48 @@ def create_plan():
     """Create a new investment plan"""
     try:
         data = request.get_json()
+        allocation = data['allocation']
+        
+        # Reject bad allocations before anything is written; the simulation needs numbers
+        if not isinstance(allocation, dict) or not all(
+            value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))
+            for value in allocation.values()
+        ):
+            return jsonify({
+                'success': False,
+                'error': 'allocation must map buckets to numeric percentages'
+            }), 400
         
         plan = Plan(
             user_id=data['user_id'],
             goal_id=data['goal_id'],
-            allocation_json=json.dumps(data['allocation']),
+            allocation_json=json.dumps(allocation),
             monthly_amount=data['monthly_amount']
         )
         
         db.session.add(plan)
-        db.session.commit()
+        db.session.flush()
         
-        # Create projections for the plan
+        # Create projections for the plan: client-supplied, or simulated server-side
         projections_data = data.get('projections', {})
         if projections_data:
-            projection = Projection(
+            db.session.add(Projection(
                 plan_id=plan.id,
                 base_coverage_min=projections_data.get('base_coverage_min', 0),
                 base_coverage_max=projections_data.get('base_coverage_max', 0),
                 stress_coverage_min=projections_data.get('stress_coverage_min', 0),
                 stress_coverage_max=projections_data.get('stress_coverage_max', 0),
                 assumptions=json.dumps(projections_data.get('assumptions', []))
-            )
-            db.session.add(projection)
-            db.session.commit()
+            ))
+        else:
+            goal = db.session.get(Goal, plan.goal_id)
+            # Fewer paths for long horizons; too long to simulate at all leaves the plan without one
+            paths = paths_within_limit(goal.horizon_months) if goal else None
+            if paths:
+                db.session.add(build_plan_projection(plan, goal, paths=paths))
+        
+        # Plan and projection are stored together or not at all
+        db.session.commit()
         
         return jsonify({
             'success': True,
@@ -172,20 +192,76 @@ def create_plan():
             'error': str(e)
         }), 500
 
+@investments_bp.route('/plans/<int:plan_id>/projections', methods=['POST'])
+def simulate_plan_projection(plan_id):
+    """Run the Monte Carlo projection for a plan and store the result"""
+    try:
+        plan = Plan.query.get_or_404(plan_id)
+        data = request.get_json(silent=True) or {}
+        paths = data.get('paths', DEFAULT_PATHS)
+        seed = data.get('seed')
+        
+        if isinstance(paths, bool) or not isinstance(paths, int):
+            return jsonify({
+                'success': False,
+                'error': 'paths must be an integer'
+            }), 400
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+            return jsonify({
+                'success': False,
+                'error': 'seed must be a non-negative integer'
+            }), 400
+        
+        goal = plan.goal
+        if goal is None:
+            return jsonify({
+                'success': False,
+                'error': 'Plan has no goal to project against'
+            }), 400
+        
+        if clamp_paths(paths) * max(goal.horizon_months, 0) > MAX_PATH_MONTHS:
+            return jsonify({
+                'success': False,
+                'error': f'Simulation too large (paths x horizon months must be at most {MAX_PATH_MONTHS})'
+            }), 400
+        
+        projection = build_plan_projection(plan, goal, paths=paths, seed=seed)
+        db.session.add(projection)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'data': projection.to_dict()
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @investments_bp.route('/plans/<int:user_id>', methods=['GET'])
 def get_user_plans(user_id):
     """Get all plans for a user"""
     try:
-        plans = Plan.query.filter_by(user_id=user_id).all()
-        plans_data = []
+        include = parse_include(PLAN_INCLUDES)
         
-        for plan in plans:
+        # Goals joined and projections loaded in one extra IN query
+        query = Plan.query.filter_by(user_id=user_id).order_by(Plan.id)
+        if 'goal' in include:
+            query = query.options(db.joinedload(Plan.goal))
+        if 'projections' in include:
+            query = query.options(db.selectinload(Plan.projections))
+        
+        plans_data = []
+        for plan in query:
             plan_dict = plan.to_dict()
             # Add goal information
-            if plan.goal:
+            if 'goal' in include and plan.goal:
                 plan_dict['goal'] = plan.goal.to_dict()
             # Add projections
-            if plan.projections:
+            if 'projections' in include and plan.projections:
                 plan_dict['projections'] = [proj.to_dict() for proj in plan.projections]
             plans_data.append(plan_dict)
         
@@ -205,13 +281,28 @@ def get_user_plans(user_id):
 def get_financial_health_score(user_id):
     """Calculate financial health score for a user"""
     try:
-        user = User.query.get_or_404(user_id)
-        
-        # Get latest asset snapshot
-        latest_snapshot = AssetSnapshot.query.filter_by(user_id=user_id).order_by(AssetSnapshot.created_at.desc()).first()
+        # Serve the stored score while it is fresh
+        stored = get_fresh_health_score(user_id)
+        if not stored:
+            user = User.query.get_or_404(user_id)
+            
+            # Get latest asset snapshot
+            latest_snapshot = db.session.get(LatestAssetSnapshot, user_id)
+            
+            # Calculate health score
+            calculated = calculate_financial_health_score(user, latest_snapshot)
+            row = {
+                'user_id': user_id,
+                'score': calculated['score'],
+                'rating': calculated['rating'],
+                'factors': json.dumps(calculated['factors'])
+            }
+            store_health_scores([row])  # adds computed_at
+            stored = HealthScore(**row)
         
-        # Calculate health score
-        health_score = calculate_financial_health_score(user, latest_snapshot)
+        # Same payload whether the score was stored or just computed
+        health_score = stored.to_dict()
+        health_score['recommendations'] = get_health_recommendations(stored.score, health_score['factors'])
         
         return jsonify({
             'success': True,
@@ -256,10 +347,39 @@ def update_user_assets(user_id):
             'error': str(e)
         }), 500
 
+# Related data callers can request with ?include= (all by default)
+GOAL_INCLUDES = ('zone',)
+PLAN_INCLUDES = ('goal', 'projections')
+
+def parse_include(allowed):
+    """Relations named in ?include=a,b; all of allowed when the parameter is absent"""
+    include = request.args.get('include')
+    if include is None:
+        return set(allowed)
+    return {name.strip() for name in include.split(',')} & set(allowed)
+
+@job_handler('recommendations')
+def build_investment_recommendations(data):
+    """Recommendations payload for a /recommendations request body"""
+    # Extract user profile and goal data
+    user_profile = data.get('user_profile', {})
+    goal_data = data.get('goal_data', {})
+    zone_id = data.get('zone_id')
+    
+    # Get zone data if provided
+    zone_data = None
+    if zone_id:
+        zone = Zone.query.get(zone_id)
+        if zone:
+            zone_data = zone.to_dict()
+    
+    # Generate recommendations
+    return generate_portfolio_recommendations(user_profile, goal_data, zone_data)
+
 def generate_portfolio_recommendations(user_profile, goal_data, zone_data):
     """Generate AI-powered portfolio recommendations"""
     try:
-        if not openai.api_key:
+        if not llm_available():
             return get_default_recommendations(user_profile, goal_data, zone_data)
         
         # Prepare context for AI
@@ -289,19 +409,17 @@ def generate_portfolio_recommendations(user_profile, goal_data, zone_data):
         
         Format as JSON with portfolios array containing name, allocation object, rationale array, and confidence."""
         
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        ai_text = chat_completion(
+            [
                 {"role": "system", "content": "You are a conservative financial advisor providing portfolio recommendations."},
                 {"role": "user", "content": prompt}
             ],
+            namespace='portfolio_recommendations',
             max_tokens=1000,
             temperature=0.7
         )
         
         # Parse AI response (simplified - in production, use more robust parsing)
-        ai_text = response.choices[0].message.content
-        
         return {
             'portfolios': parse_ai_recommendations(ai_text),
             'generated_by': 'AI',
@@ -0,0 +1,200 @@
+from src.models.investment import AssetSnapshot, Goal, HealthScore, LatestAssetSnapshot
+from src.models.user import User, db
+from src.services import model_events
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import json
+import os
+
+# Stored scores older than this are recomputed on read
+HEALTH_SCORE_MAX_AGE = timedelta(seconds=int(os.getenv('HEALTH_SCORE_MAX_AGE', 24 * 60 * 60)))
+
+ASSET_COLUMNS = ['savings', 'mf', 'stocks', 'gold', 'epf', 'real_estate']
+FACTOR_NAMES = ['income', 'expense_ratio', 'diversification', 'debt', 'goal_planning']
+
+_table = HealthScore.__table__
+
+def load_cohort(user_ids=None):
+    """Users joined with their latest asset snapshot and goal count (three queries)"""
+    users = db.select(User.id.label('user_id'), User.monthly_income, User.monthly_expenses)
+
+    latest = db.select(
+        LatestAssetSnapshot.user_id,
+        *[getattr(LatestAssetSnapshot, column) for column in ASSET_COLUMNS],
+        LatestAssetSnapshot.liabilities
+    )
+
+    goals = db.select(
+        Goal.user_id, db.func.count(Goal.id).label('goals_count')
+    ).group_by(Goal.user_id)
+
+    if user_ids is not None:
+        users = users.where(User.id.in_(user_ids))
+        latest = latest.where(LatestAssetSnapshot.user_id.in_(user_ids))
+        goals = goals.where(Goal.user_id.in_(user_ids))
+
+    with db.engine.connect() as connection:
+        users_df = pd.DataFrame(connection.execute(users).mappings().all(),
+                                columns=['user_id', 'monthly_income', 'monthly_expenses'])
+        snapshots_df = pd.DataFrame(connection.execute(latest).mappings().all(),
+                                    columns=['user_id'] + ASSET_COLUMNS + ['liabilities'])
+        goals_df = pd.DataFrame(connection.execute(goals).mappings().all(),
+                                columns=['user_id', 'goals_count'])
+
+    snapshots_df['has_snapshot'] = True
+    cohort = users_df.merge(snapshots_df, on='user_id', how='left')
+    cohort = cohort.merge(goals_df, on='user_id', how='left')
+    return cohort
+
+def _tiers(conditions, points, labels, default_points=0, default_label=None):
+    return (
+        np.select(conditions, points, default_points),
+        np.select(conditions, labels, default_label).astype(object)
+    )
+
+def score_cohort(cohort):
+    """Vectorized calculate_financial_health_score over a load_cohort frame.
+
+    Applies the same tiers as the per-user rules and returns a frame of
+    user_id, score, rating and one label column per factor (missing when
+    the factor does not apply).
+    """
+    n = len(cohort)
+    income = cohort['monthly_income'].fillna(0).to_numpy(dtype=float)
+    expenses = cohort['monthly_expenses'].fillna(0).to_numpy(dtype=float)
+    has_snapshot = cohort['has_snapshot'].fillna(False).to_numpy(dtype=bool)
+    assets = cohort[ASSET_COLUMNS].fillna(0).to_numpy(dtype=float)
+    liabilities = cohort['liabilities'].fillna(0).to_numpy(dtype=float)
+    goals_count = cohort['goals_count'].fillna(0).to_numpy(dtype=int)
+
+    has_income = income != 0
+    safe_income = np.where(has_income, income, 1.0)
+    score = np.zeros(n, dtype=int)
+    factors = {}
+
+    # Income factor (20 points)
+    points, labels = _tiers(
+        [income >= 100000, income >= 50000, income >= 25000],
+        [20, 15, 10], ['Excellent', 'Good', 'Average'], 5, 'Below Average'
+    )
+    score += np.where(has_income, points, 0)
+    factors['income'] = np.where(has_income, labels, None)
+
+    # Expense ratio factor (20 points)
+    applies = has_income & (expenses != 0)
+    expense_ratio = expenses / safe_income
+    points, labels = _tiers(
+        [expense_ratio <= 0.5, expense_ratio <= 0.7, expense_ratio <= 0.9],
+        [20, 15, 10], ['Excellent', 'Good', 'Average'], 5, 'Poor'
+    )
+    score += np.where(applies, points, 0)
+    factors['expense_ratio'] = np.where(applies, labels, None)
+
+    # Asset diversification factor (30 points)
+    applies = has_snapshot & (assets.sum(axis=1) > 0)
+    asset_types = (assets > 0).sum(axis=1)
+    points, labels = _tiers(
+        [asset_types >= 4, asset_types >= 3, asset_types >= 2],
+        [30, 20, 15], ['Excellent', 'Good', 'Average'], 10, 'Poor'
+    )
+    score += np.where(applies, points, 0)
+    factors['diversification'] = np.where(applies, labels, None)
+
+    # Debt factor (20 points); no debt scores full marks
+    has_debt = has_snapshot & (liabilities != 0)
+    applies = has_debt & has_income
+    debt_to_income = liabilities * 12 / safe_income
+    points, labels = _tiers(
+        [debt_to_income <= 2, debt_to_income <= 4, debt_to_income <= 6],
+        [20, 15, 10], ['Excellent', 'Good', 'Average'], 5, 'Poor'
+    )
+    score += np.where(applies, points, np.where(has_debt, 0, 20))
+    factors['debt'] = np.where(applies, labels, np.where(has_debt, None, 'Excellent'))
+
+    # Goal setting factor (10 points)
+    points, labels = _tiers(
+        [goals_count >= 3, goals_count >= 2, goals_count >= 1],
+        [10, 8, 5], ['Excellent', 'Good', 'Average'], 0, 'Poor'
+    )
+    score += points
+    factors['goal_planning'] = labels
+
+    rating = np.select(
+        [score >= 85, score >= 70, score >= 55, score >= 40],
+        ['Excellent', 'Good', 'Average', 'Below Average'], 'Poor'
+    )
+
+    result = pd.DataFrame({
+        'user_id': cohort['user_id'].to_numpy(),
+        'score': np.minimum(score, 100),
+        'rating': rating
+    })
+    for name in FACTOR_NAMES:
+        result[name] = factors[name]
+    return result
+
+def _factors_json(row):
+    # pandas turns missing labels into NaN, so keep only real labels
+    return json.dumps({name: row[name] for name in FACTOR_NAMES if isinstance(row[name], str)})
+
+def store_health_scores(rows):
+    """Upsert [{user_id, score, rating, factors}] with a fresh computed_at"""
+    if not rows:
+        return
+    now = datetime.utcnow()
+    for row in rows:
+        row['computed_at'] = now
+    stmt = sqlite_insert(_table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_table.c.user_id],
+        set_={column: stmt.excluded[column] for column in ('score', 'rating', 'factors', 'computed_at')}
+    )
+    with db.engine.begin() as connection:
+        connection.execute(stmt, rows)
+
+def refresh_health_scores(user_ids=None):
+    """Score every user (or user_ids) in one pass and store the results"""
+    scores = score_cohort(load_cohort(user_ids))
+    rows = [
+        {
+            'user_id': int(row['user_id']),
+            'score': int(row['score']),
+            'rating': row['rating'],
+            'factors': _factors_json(row)
+        }
+        for row in scores.to_dict('records')
+    ]
+    store_health_scores(rows)
+    return len(rows)
+
+def get_fresh_health_score(user_id):
+    """Stored HealthScore for user_id if it is younger than HEALTH_SCORE_MAX_AGE"""
+    stored = db.session.get(HealthScore, user_id)
+    if stored is None or stored.computed_at is None:
+        return None
+    if datetime.utcnow() - stored.computed_at > HEALTH_SCORE_MAX_AGE:
+        return None
+    return stored
+
+def _invalidate(user_ids):
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        with db.engine.begin() as connection:
+            connection.execute(_table.delete().where(_table.c.user_id.in_(user_ids)))
+
+def _on_user_changes(changes):
+    _invalidate(row['id'] for _, row, _ in changes)
+
+def _on_user_data_changes(changes):
+    _invalidate(
+        user_id
+        for _, row, previous in changes
+        for user_id in (row['user_id'], previous.get('user_id'))
+    )
+
+# Scores depend on the user row, their latest snapshot and their goals
+model_events.subscribe(User, _on_user_changes)
+model_events.subscribe(AssetSnapshot, _on_user_data_changes)
+model_events.subscribe(Goal, _on_user_data_changes)
@@ -0,0 +1,298 @@
+from src.models.zone import Zone, Event
+from src.models.user import db
+from src.services import model_events
+from src.services.zone_momentum import apply_momentum_deltas, event_contribution
+from datetime import date, datetime
+import csv
+import io
+import itertools
+import json
+
+INGEST_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+def _text(value):
+    value = str(value).strip()
+    if not value:
+        raise ValueError('must not be empty')
+    return value
+
+def _upper(value):
+    return _text(value).upper()
+
+def _date(value):
+    return date.fromisoformat(_text(value)[:10])
+
+def _json_list(value):
+    if isinstance(value, list):
+        return json.dumps(value)
+    value = str(value).strip()
+    json.loads(value)  # validate
+    return value
+
+# column -> (parser, required)
+ZONE_COLUMNS = {
+    'id': (int, False),
+    'country_code': (_upper, False),
+    'state': (_text, True),
+    'city': (_text, True),
+    'name': (_text, True),
+    'rank': (int, True),
+    'outlook': (_upper, True),
+    'confidence': (_upper, True),
+    'lat': (float, True),
+    'lng': (float, True)
+}
+
+EVENT_COLUMNS = {
+    'id': (int, False),
+    'zone_id': (int, True),
+    'type': (_upper, True),
+    'title': (_text, True),
+    'description': (_text, True),
+    'start_date': (_date, True),
+    'expected_impact_bps': (int, True),
+    'evidence_links': (_json_list, False),
+    'status': (_upper, False)
+}
+
+DEFAULTS = {
+    'zones': {'country_code': 'IN'},
+    'events': {'status': 'ANNOUNCED', 'evidence_links': None}
+}
+
+class StreamError(ValueError):
+    """The body can't be read past this point (e.g. broken CSV quoting)"""
+
+def iter_records(stream, fmt):
+    """Yield (line_number, record dict or parse error) from a CSV/NDJSON byte stream.
+
+    NDJSON lines are decoded one by one, so a line with invalid UTF-8 is
+    reported and skipped. CSV has no reliable resync point, so an
+    undecodable byte or malformed quoting yields a StreamError and ends
+    the stream.
+    """
+    lines = io.BufferedReader(stream)
+    if fmt == 'csv':
+        # Decoded line by line so every row before a bad byte is still ingested
+        reader = csv.DictReader(raw.decode('utf-8') for raw in lines)
+        try:
+            for record in reader:
+                yield reader.line_num, record
+        except (UnicodeDecodeError, csv.Error) as e:
+            yield reader.line_num + 1, StreamError(f'unreadable CSV, stopped here: {e}')
+    else:
+        for line_number, raw in enumerate(lines, start=1):
+            try:
+                line = raw.decode('utf-8')
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError('each line must be a JSON object')
+            except ValueError as e:  # includes UnicodeDecodeError
+                yield line_number, e
+                continue
+            yield line_number, record
+
+def parse_record(record, columns):
+    """Coerce a raw record into a dict of the columns it sets, raising ValueError on bad input.
+
+    Optional columns left out of the record are left out of the dict too:
+    inserts fill them from DEFAULTS, updates keep the stored value.
+    """
+    row = {}
+    for column, (parser, required) in columns.items():
+        value = record.get(column)
+        if value is None or value == '':
+            if required:
+                raise ValueError(f'{column} is required')
+            continue
+        try:
+            row[column] = parser(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f'invalid {column}: {e}')
+    return row
+
+def ingest(table_name, stream, fmt, batch_size=INGEST_BATCH_SIZE):
+    """Upsert zones or events from a stream, committing every batch_size rows"""
+    columns = ZONE_COLUMNS if table_name == 'zones' else EVENT_COLUMNS
+    report = {
+        'processed': 0, 'inserted': 0, 'updated': 0, 'superseded': 0, 'failed': 0, 'batches': 0, 'errors': []
+    }
+
+    def record_error(line_number, message):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'line': line_number, 'error': str(message)})
+
+    records = iter_records(stream, fmt)
+    while True:
+        chunk = list(itertools.islice(records, batch_size))
+        if not chunk:
+            break
+        report['processed'] += len(chunk)
+
+        batch = []
+        for line_number, record in chunk:
+            if isinstance(record, StreamError):
+                report['stopped_at_line'] = line_number
+            if isinstance(record, Exception):
+                record_error(line_number, record)
+                continue
+            try:
+                batch.append((line_number, parse_record(record, columns)))
+            except ValueError as e:
+                record_error(line_number, e)
+
+        # Only the last row for an id persists, so it is the only one written
+        deduped = _last_per_id(batch)
+        report['superseded'] += len(batch) - len(deduped)
+        batch = deduped
+
+        if batch:
+            if table_name == 'zones':
+                inserted, updated = _write_zones(batch)
+            else:
+                inserted, updated = _write_events(batch, record_error)
+            report['inserted'] += inserted
+            report['updated'] += updated
+        report['batches'] += 1
+
+    return report
+
+def _last_per_id(batch):
+    """Drop rows overridden by a later row with the same explicit id"""
+    last = {row['id']: index for index, (_, row) in enumerate(batch) if 'id' in row}
+    return [
+        (line_number, row) for index, (line_number, row) in enumerate(batch)
+        if 'id' not in row or last[row['id']] == index
+    ]
+
+def _upsert(connection, table, rows, columns, existing, defaults):
+    """Write rows with raw executemany calls and return them as full rows with ids and created_at.
+
+    existing maps ids already in the table to their current row. Those rows
+    update only the columns the record sets (keeping created_at and any
+    omitted optional columns); all other rows are inserted with defaults
+    for the columns they omit. Statements go straight to the DBAPI cursor:
+    SQLAlchemy's per-row parameter processing dominated the load time for
+    large files.
+    """
+    now = datetime.utcnow()
+    created_at = now.strftime('%Y-%m-%d %H:%M:%S.%f')
+    updates = [row for row in rows if row.get('id') in existing]
+    inserts = [{**defaults, **row} for row in rows if row.get('id') not in existing]
+    with_id = [row for row in inserts if 'id' in row]
+    without_id = [row for row in inserts if 'id' not in row]
+
+    # One UPDATE per distinct set of provided columns
+    by_columns = {}
+    for row in updates:
+        by_columns.setdefault(tuple(column for column in columns if column in row), []).append(row)
+    for update_columns, group in by_columns.items():
+        assignments = ', '.join(f'{column} = :{column}' for column in update_columns)
+        connection.exec_driver_sql(
+            f'UPDATE {table.name} SET {assignments} WHERE id = :id',
+            [_parameters(row, ('id',) + update_columns) for row in group]
+        )
+
+    if with_id:
+        connection.exec_driver_sql(
+            _insert_sql(table, ['id'] + columns),
+            [{**_parameters(row, ['id'] + columns), 'created_at': created_at} for row in with_id]
+        )
+    if without_id:
+        connection.exec_driver_sql(
+            _insert_sql(table, columns),
+            [{**_parameters(row, columns), 'created_at': created_at} for row in without_id]
+        )
+        # One executemany inside our write transaction allocates consecutive rowids
+        last_id = connection.exec_driver_sql('SELECT last_insert_rowid()').scalar()
+        for new_id, row in enumerate(without_id, start=last_id - len(without_id) + 1):
+            row['id'] = new_id
+
+    for row in inserts:
+        row['created_at'] = now
+    return [{**existing[row['id']], **row} for row in updates] + inserts
+
+def _insert_sql(table, columns):
+    names = ', '.join(columns + ['created_at'])
+    placeholders = ', '.join(f':{column}' for column in columns + ['created_at'])
+    return f'INSERT INTO {table.name} ({names}) VALUES ({placeholders})'
+
+def _parameters(row, columns):
+    # Dates are pre-formatted the way SQLAlchemy's SQLite types store them
+    values = {column: row.get(column) for column in columns}
+    if values.get('start_date') is not None:
+        values['start_date'] = values['start_date'].isoformat()
+    return values
+
+def _existing(connection, table, rows):
+    """{id: current row} for the rows whose explicit id is already present"""
+    ids = [row['id'] for row in rows if 'id' in row]
+    if not ids:
+        return {}
+    return {
+        row['id']: row
+        for row in connection.execute(db.select(table).where(table.c.id.in_(ids))).mappings()
+    }
+
+def _changes(written, existing):
+    """model_events change tuples for rows written by _upsert"""
+    changes = []
+    for row in written:
+        old = existing.get(row['id'])
+        if old is None:
+            changes.append(('insert', row, {}))
+        else:
+            previous = {key: old[key] for key in row if key in old and old[key] != row[key]}
+            changes.append(('update', row, previous))
+    return changes
+
+def _write_zones(batch):
+    table = Zone.__table__
+    rows = [row for _, row in batch]
+    columns = [column for column in ZONE_COLUMNS if column != 'id']
+    with db.engine.begin() as connection:
+        existing = _existing(connection, table, rows)
+        written = _upsert(connection, table, rows, columns, existing, DEFAULTS['zones'])
+
+    model_events.publish(table.name, _changes(written, existing))
+    return len(written) - len(existing), len(existing)
+
+def _write_events(batch, record_error):
+    table = Event.__table__
+    columns = [column for column in EVENT_COLUMNS if column != 'id']
+
+    with db.engine.begin() as connection:
+        zone_ids = {row['zone_id'] for _, row in batch}
+        known_zones = {row[0] for row in connection.execute(
+            db.select(Zone.__table__.c.id).where(Zone.__table__.c.id.in_(zone_ids))
+        )}
+        rows = []
+        for line_number, row in batch:
+            if row['zone_id'] in known_zones:
+                rows.append(row)
+            else:
+                record_error(line_number, f"unknown zone_id {row['zone_id']}")
+        if not rows:
+            return 0, 0
+
+        existing = _existing(connection, table, rows)
+        written = _upsert(connection, table, rows, columns, existing, DEFAULTS['events'])
+
+        # Momentum is maintained by ORM hooks; apply the same deltas here
+        deltas = {}
+        for old in existing.values():
+            deltas[old['zone_id']] = deltas.get(old['zone_id'], 0.0) - event_contribution(
+                old['start_date'], old['created_at'], old['expected_impact_bps'], old['status']
+            )
+        for new in written:
+            deltas[new['zone_id']] = deltas.get(new['zone_id'], 0.0) + event_contribution(
+                new['start_date'], new['created_at'], new['expected_impact_bps'], new['status']
+            )
+        apply_momentum_deltas(connection, deltas)
+
+    model_events.publish(table.name, _changes(written, existing))
+    return len(written) - len(existing), len(existing)
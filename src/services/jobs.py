@@ -0,0 +1,86 @@
+from flask import current_app, jsonify, request, url_for
+from src.models.job import Job
+from src.models.user import db
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import json
+import os
+import uuid
+
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='job-worker')
+
+# job kind -> callable(params) returning a JSON-serializable result
+_handlers = {}
+
+def job_handler(kind):
+    """Register a function as the handler for jobs of the given kind"""
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+def wants_async():
+    """True when the client asked for the 202 + polling flow"""
+    if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+def enqueue_job(kind, params):
+    """Persist a QUEUED job and hand it to the worker pool"""
+    if kind not in _handlers:
+        raise ValueError(f'Unknown job kind: {kind}')
+
+    job = Job(id=uuid.uuid4().hex, kind=kind, status='QUEUED', params=json.dumps(params, default=str))
+    db.session.add(job)
+    db.session.commit()
+
+    _executor.submit(_run_job, current_app._get_current_object(), job.id)
+    return job
+
+def _run_job(app, job_id):
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        if job is None:
+            return
+        job.status = 'RUNNING'
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+
+        try:
+            params = json.loads(job.params) if job.params else {}
+            result = _handlers[job.kind](params)
+            job.result = json.dumps(result, default=str)
+            job.status = 'SUCCEEDED'
+        except Exception as e:
+            db.session.rollback()
+            job = db.session.get(Job, job_id)
+            job.error = str(e)
+            job.status = 'FAILED'
+
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+def fail_interrupted_jobs():
+    """Jobs only live in this process's pool; fail ones left over from a restart"""
+    Job.query.filter(Job.status.in_(['QUEUED', 'RUNNING'])).update(
+        {'status': 'FAILED', 'error': 'Interrupted by server restart', 'finished_at': datetime.utcnow()},
+        synchronize_session=False
+    )
+    db.session.commit()
+
+def job_accepted_response(job):
+    """202 response pointing the client at the job status endpoint"""
+    status_url = url_for('jobs.get_job', job_id=job.id)
+    response = jsonify({
+        'success': True,
+        'data': {
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': status_url
+        }
+    })
+    response.status_code = 202
+    response.headers['Location'] = status_url
+    return response
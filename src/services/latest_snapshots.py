@@ -0,0 +1,63 @@
+from src.models.investment import AssetSnapshot, LatestAssetSnapshot
+from src.models.user import db
+from sqlalchemy import event, inspect
+
+ASSET_COLUMNS = ['savings', 'mf', 'stocks', 'gold', 'epf', 'real_estate']
+
+_snapshots = AssetSnapshot.__table__
+_table = LatestAssetSnapshot.__table__
+
+def refresh_latest_snapshots(connection, user_ids=None):
+    """Rebuild latest_asset_snapshot rows for user_ids (or all users) from asset_snapshots"""
+    ranked = db.select(
+        _snapshots,
+        db.func.row_number().over(
+            partition_by=_snapshots.c.user_id,
+            order_by=(_snapshots.c.created_at.desc(), _snapshots.c.id.desc())
+        ).label('position')
+    )
+    delete = _table.delete()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        ranked = ranked.where(_snapshots.c.user_id.in_(user_ids))
+        delete = delete.where(_table.c.user_id.in_(user_ids))
+
+    ranked = ranked.subquery()
+    total_assets = sum(db.func.coalesce(ranked.c[column], 0) for column in ASSET_COLUMNS)
+    latest = db.select(
+        ranked.c.user_id,
+        ranked.c.id,
+        *[ranked.c[column] for column in ASSET_COLUMNS],
+        ranked.c.liabilities,
+        total_assets - db.func.coalesce(ranked.c.liabilities, 0),
+        ranked.c.as_of_date,
+        ranked.c.created_at
+    ).where(ranked.c.position == 1)
+
+    connection.execute(delete)
+    connection.execute(_table.insert().from_select(
+        ['user_id', 'snapshot_id'] + ASSET_COLUMNS + ['liabilities', 'net_worth', 'as_of_date', 'created_at'],
+        latest
+    ))
+
+# Keep the latest row in the flush's transaction, so readers never see a
+# snapshot without its materialized copy
+@event.listens_for(AssetSnapshot, 'after_insert')
+@event.listens_for(AssetSnapshot, 'after_delete')
+def _snapshot_written(mapper, connection, target):
+    refresh_latest_snapshots(connection, [target.user_id])
+
+@event.listens_for(AssetSnapshot, 'after_update')
+def _snapshot_updated(mapper, connection, target):
+    history = inspect(target).attrs.user_id.history
+    refresh_latest_snapshots(connection, {target.user_id, *history.deleted})
+
+def init_latest_snapshots():
+    """Create the (user_id, created_at) index and backfill older databases"""
+    with db.engine.begin() as connection:
+        for index in _snapshots.indexes:
+            index.create(connection, checkfirst=True)
+        has_latest = connection.execute(db.select(_table.c.user_id).limit(1)).first() is not None
+        has_snapshots = connection.execute(db.select(_snapshots.c.id).limit(1)).first() is not None
+        if has_snapshots and not has_latest:
+            refresh_latest_snapshots(connection)
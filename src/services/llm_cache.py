@@ -0,0 +1,152 @@
+from src.models.llm_cache import LLMCacheEntry
+from src.models.user import db
+from collections import Counter
+from datetime import datetime, timedelta
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 5000))
+
+# Hits buffer their access time in memory; it reaches the table with the
+# next cache_set or at most this many seconds later, so reads never write
+ACCESS_FLUSH_INTERVAL = float(os.getenv('LLM_CACHE_ACCESS_FLUSH_INTERVAL', 30))
+
+_table = LLMCacheEntry.__table__
+
+_access_times = {}          # key -> last hit not yet written
+_access_lock = threading.Lock()
+_last_access_flush = time.monotonic()
+
+# Process-wide hit / miss / eviction counters, see cache_stats()
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+def _count(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+def _pack(value):
+    return zlib.compress(json.dumps(value, default=str).encode('utf-8'))
+
+def _unpack(payload):
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+def make_cache_key(namespace, payload):
+    """Stable sha256 key for a JSON-serializable request description"""
+    raw = json.dumps([namespace, payload], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def cache_get(key):
+    """Cached value for key, or None when missing or expired.
+
+    Read-only: expired rows are left for the next cache_set to purge, and
+    the LRU access time is buffered in memory (see flush_access_times).
+    """
+    now = datetime.utcnow()
+    with db.engine.connect() as conn:
+        row = conn.execute(
+            db.select(_table.c.payload, _table.c.expires_at).where(_table.c.key == key)
+        ).first()
+    if row is None:
+        _count('misses')
+        return None
+    if row.expires_at <= now:
+        _count('misses')  # counted as expired when cache_set purges it
+        return None
+    try:
+        value = _unpack(row.payload)
+    except (zlib.error, TypeError, ValueError):
+        _count('misses')
+        return None  # unreadable entry, recompute and overwrite it
+    _count('hits')
+    _record_access(key, now)
+    return value
+
+def _record_access(key, now):
+    global _last_access_flush
+    with _access_lock:
+        _access_times[key] = now
+        due = time.monotonic() - _last_access_flush >= ACCESS_FLUSH_INTERVAL
+        if due:
+            _last_access_flush = time.monotonic()
+    if due:
+        with db.engine.begin() as conn:
+            flush_access_times(conn)
+
+def flush_access_times(conn):
+    """Write buffered last_accessed_at values in one executemany"""
+    with _access_lock:
+        pending = list(_access_times.items())
+        _access_times.clear()
+    if pending:
+        conn.execute(
+            _table.update().where(_table.c.key == db.bindparam('access_key')).values(
+                last_accessed_at=db.bindparam('accessed_at')
+            ),
+            [{'access_key': key, 'accessed_at': accessed_at} for key, accessed_at in pending]
+        )
+
+def cache_set(key, namespace, value, ttl_seconds=DEFAULT_TTL_SECONDS):
+    """Store value under key and evict expired / least recently used entries"""
+    now = datetime.utcnow()
+    values = {
+        'namespace': namespace,
+        'payload': _pack(value),
+        'created_at': now,
+        'expires_at': now + timedelta(seconds=ttl_seconds),
+        'last_accessed_at': now
+    }
+    with db.engine.begin() as conn:
+        flush_access_times(conn)  # eviction order needs the latest access times
+        updated = conn.execute(_table.update().where(_table.c.key == key).values(**values)).rowcount
+        if not updated:
+            conn.execute(_table.insert().values(key=key, **values))
+        _evict(conn, now)
+    _count('stores')
+
+def _evict(conn, now):
+    expired = conn.execute(_table.delete().where(_table.c.expires_at <= now)).rowcount
+    overflow = conn.execute(db.select(db.func.count()).select_from(_table)).scalar() - MAX_ENTRIES
+    evicted = 0
+    if overflow > 0:
+        oldest = db.select(_table.c.key).order_by(_table.c.last_accessed_at).limit(overflow)
+        evicted = conn.execute(_table.delete().where(_table.c.key.in_(oldest.scalar_subquery()))).rowcount
+    _count('expired', max(expired, 0))
+    _count('evictions', max(evicted, 0))
+
+def cache_stats():
+    """Counters since process start plus the current size of the cache table"""
+    with db.engine.connect() as conn:
+        entries, payload_bytes = conn.execute(
+            db.select(db.func.count(), db.func.coalesce(db.func.sum(db.func.length(_table.c.payload)), 0))
+        ).one()
+    with _stats_lock:
+        stats = {name: _stats[name] for name in ('hits', 'misses', 'expired', 'evictions', 'stores')}
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+    stats['entries'] = entries
+    stats['payload_bytes'] = payload_bytes
+    stats['max_entries'] = MAX_ENTRIES
+    return stats
+
+def get_or_compute(key, namespace, compute, ttl_seconds=DEFAULT_TTL_SECONDS):
+    """Return the cached value for key or compute and store it.
+
+    Concurrent identical calls are merged one level up (llm_gateway's
+    single-flight), so this does no coordination of its own.
+    """
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
+    value = compute()
+    try:
+        cache_set(key, namespace, value, ttl_seconds)
+    except Exception:
+        pass  # caching is best effort, the caller still gets its value
+    return value
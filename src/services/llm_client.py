@@ -0,0 +1,175 @@
+from collections import deque
+import openai
+import os
+import threading
+import time
+
+# Set up OpenAI API key (OPENAI_API_BASE points the client at another server, e.g. a local fake)
+openai.api_key = os.getenv('OPENAI_API_KEY')
+openai.api_base = os.getenv('OPENAI_API_BASE', openai.api_base)
+
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+LLM_QUEUE_TIMEOUT = float(os.getenv('LLM_QUEUE_TIMEOUT', 5))        # seconds waiting for a slot
+LLM_REQUEST_TIMEOUT = float(os.getenv('LLM_REQUEST_TIMEOUT', 20))   # seconds per upstream call
+LLM_BREAKER_THRESHOLD = int(os.getenv('LLM_BREAKER_THRESHOLD', 5))  # consecutive failures to open
+LLM_BREAKER_COOLDOWN = float(os.getenv('LLM_BREAKER_COOLDOWN', 30)) # seconds before a trial call
+
+LATENCY_WINDOW = 1000
+
+class LLMUnavailable(Exception):
+    """The call was not attempted: circuit open or no free slot in time"""
+
+class CircuitBreaker:
+    """Opens after threshold consecutive failures; one trial call after cooldown.
+
+    closed -> open on the threshold-th failure in a row; open -> half_open
+    once cooldown has passed, letting a single call through; that call's
+    outcome closes the breaker again or re-opens it.
+    """
+
+    def __init__(self, threshold=LLM_BREAKER_THRESHOLD, cooldown=LLM_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def is_open(self):
+        """True while calls would be refused (used to skip straight to fallbacks)"""
+        with self._lock:
+            if self.state == 'open':
+                return time.monotonic() - self.opened_at < self.cooldown
+            return self.state == 'half_open' and self._trial_running
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = 'half_open'
+            if self.state == 'half_open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._trial_running = False
+
+    def release_trial(self):
+        """Give back a trial slot whose call never reached the upstream"""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+            self._trial_running = False
+
+class LLMClient:
+    """Bounded, deadline-aware wrapper around openai.ChatCompletion.create"""
+
+    def __init__(self, max_concurrency=LLM_MAX_CONCURRENCY, queue_timeout=LLM_QUEUE_TIMEOUT,
+                 request_timeout=LLM_REQUEST_TIMEOUT, breaker=None):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.request_timeout = request_timeout
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._waits = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {
+            'calls': 0, 'succeeded': 0, 'failed': 0, 'timeouts': 0,
+            'rejected_open_circuit': 0, 'rejected_queue_full': 0
+        }
+        self._in_flight = 0
+        self._waiting = 0
+
+    def available(self):
+        return bool(openai.api_key) and not self.breaker.is_open()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def create(self, **params):
+        """ChatCompletion.create with a concurrency slot, deadline and breaker"""
+        if not self.breaker.allow():
+            self._count('rejected_open_circuit')
+            raise LLMUnavailable('LLM circuit breaker is open')
+
+        with self._lock:
+            self._waiting += 1
+        queued_at = time.monotonic()
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        with self._lock:
+            self._waiting -= 1
+            if acquired:
+                self._in_flight += 1
+                self._waits.append(time.monotonic() - queued_at)
+        if not acquired:
+            # Not the upstream's fault, so the breaker only releases its trial slot
+            self._count('rejected_queue_full')
+            self.breaker.release_trial()
+            raise LLMUnavailable('No free LLM slot within the queue timeout')
+
+        started_at = time.monotonic()
+        try:
+            self._count('calls')
+            response = openai.ChatCompletion.create(request_timeout=self.request_timeout, **params)
+        except Exception as e:
+            self.breaker.record_failure()
+            self._count('timeouts' if isinstance(e, openai.error.Timeout) else 'failed')
+            raise
+        else:
+            self.breaker.record_success()
+            self._count('succeeded')
+            return response
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._latencies.append(time.monotonic() - started_at)
+            self._slots.release()
+
+    def metrics(self):
+        """Counters, queue depth, breaker state and latency percentiles (ms)"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            waits = sorted(self._waits)
+            data = dict(self._counters)
+            data['in_flight'] = self._in_flight
+            data['waiting'] = self._waiting
+        data['max_concurrency'] = self.max_concurrency
+        data['breaker'] = {
+            'state': self.breaker.state,
+            'consecutive_failures': self.breaker.failures,
+            'times_opened': self.breaker.times_opened
+        }
+        data['latency_ms'] = _percentiles(latencies)
+        data['queue_wait_ms'] = _percentiles(waits)
+        return data
+
+def _percentiles(sorted_seconds):
+    if not sorted_seconds:
+        return {'count': 0}
+    def at(fraction):
+        return round(sorted_seconds[min(int(fraction * len(sorted_seconds)), len(sorted_seconds) - 1)] * 1000, 1)
+    return {
+        'count': len(sorted_seconds),
+        'p50': at(0.50),
+        'p95': at(0.95),
+        'p99': at(0.99),
+        'max': round(sorted_seconds[-1] * 1000, 1)
+    }
+
+llm_client = LLMClient()
@@ -0,0 +1,50 @@
+from src.services.llm_cache import DEFAULT_TTL_SECONDS, get_or_compute, make_cache_key
+from src.services.llm_client import llm_client
+from src.services.single_flight import SingleFlight
+
+DEFAULT_MODEL = 'gpt-3.5-turbo'
+
+# Identical requests in flight at the same time share one cache lookup and upstream call
+llm_single_flight = SingleFlight()
+
+def llm_available():
+    """False without an API key or while the circuit is open; routes use their fallbacks then"""
+    return llm_client.available()
+
+def normalize_messages(messages):
+    """Messages with each line of content stripped, so prompt indentation doesn't change the key"""
+    normalized = []
+    for message in messages:
+        content = message.get('content')
+        if isinstance(content, str):
+            content = '\n'.join(line.strip() for line in content.strip().splitlines())
+        normalized.append({**message, 'content': content})
+    return normalized
+
+def completion_cache_key(model, messages, params):
+    """Content address of a chat request: identical requests share one answer"""
+    return make_cache_key('chat_completion', {'model': model, 'messages': messages, 'params': params})
+
+def chat_completion(messages, namespace='chat', model=DEFAULT_MODEL, ttl_seconds=DEFAULT_TTL_SECONDS, **params):
+    """Assistant reply text for a chat request, via the shared LLM cache.
+
+    params are passed through to ChatCompletion.create (max_tokens,
+    temperature, ...). namespace labels the cache entry and the
+    single-flight metrics.
+    """
+    messages = normalize_messages(messages)
+    key = completion_cache_key(model, messages, params)
+    result = llm_single_flight.do(
+        key,
+        lambda: get_or_compute(key, namespace, lambda: _create(model, messages, params), ttl_seconds),
+        label=namespace
+    )
+    return result['content']
+
+def _create(model, messages, params):
+    response = llm_client.create(model=model, messages=messages, **params)
+    return {
+        'content': response.choices[0].message.content,
+        'model': response.get('model', model),
+        'usage': dict(response.get('usage') or {})
+    }
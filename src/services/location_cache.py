@@ -0,0 +1,197 @@
+from src.models.zone import Zone
+from src.services import model_events
+from src.services.spatial_index import haversine_km
+from collections import OrderedDict
+import math
+import numpy as np
+import os
+import threading
+import time
+
+# Precision 6 cells are about 1.2 km x 0.6 km: users a few hundred metres
+# apart share one cell and therefore one analysis
+LOCATION_GEOHASH_PRECISION = int(os.getenv('LOCATION_GEOHASH_PRECISION', 6))
+LOCATION_CACHE_MAX_ENTRIES = int(os.getenv('LOCATION_CACHE_MAX_ENTRIES', 10000))
+# Fallback analyses are cached briefly so the AI answer replaces them soon
+LOCATION_FALLBACK_TTL = float(os.getenv('LOCATION_FALLBACK_TTL', 60))
+
+# Requested radii are rounded up to one of these (km)
+RADIUS_BUCKETS_KM = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 20040)
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+def geohash_encode(lat, lng, precision=LOCATION_GEOHASH_PRECISION):
+    """Standard base32 geohash of a point"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return ''.join(chars)
+
+def geohash_bounds(geohash):
+    """(min_lat, max_lat, min_lng, max_lng) of a geohash cell"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            middle = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = middle
+            else:
+                interval[1] = middle
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+def radius_bucket(radius_km):
+    """Smallest bucket radius covering radius_km"""
+    for bucket in RADIUS_BUCKETS_KM:
+        if radius_km <= bucket:
+            return bucket
+    return RADIUS_BUCKETS_KM[-1]
+
+class LocationCell:
+    """Quantized location request: geohash cell plus bucketed radius.
+
+    Candidates are searched around the cell centre out to search_radius_km
+    (bucket radius plus the centre-to-corner distance), which covers every
+    zone within the bucket radius of any point in the cell. Each request
+    then filters them by its own point and radius.
+    """
+
+    def __init__(self, lat, lng, radius_km, precision=LOCATION_GEOHASH_PRECISION):
+        self.geohash = geohash_encode(lat, lng, precision)
+        min_lat, max_lat, min_lng, max_lng = geohash_bounds(self.geohash)
+        self.lat = (min_lat + max_lat) / 2
+        self.lng = (min_lng + max_lng) / 2
+        self.radius_km = radius_bucket(radius_km)
+        half_diagonal_km = max(
+            float(haversine_km(math.radians(self.lat), math.radians(self.lng), math.radians(corner_lat), math.radians(corner_lng)))
+            for corner_lat in (min_lat, max_lat) for corner_lng in (min_lng, max_lng)
+        )
+        self.search_radius_km = self.radius_km + half_diagonal_km
+
+    @property
+    def key(self):
+        return (self.geohash, self.radius_km)
+
+class _CellEntry:
+    def __init__(self, cell, candidates):
+        self.cell = cell
+        self.candidates = candidates    # zone dicts within cell.search_radius_km of the centre
+        self.coords = np.radians([(zone['lat'], zone['lng']) for zone in candidates]).reshape(-1, 2)
+        self.analyses = {}              # ids of the zones the analysis used -> (analysis, expires_at or None)
+
+class LocationAnalysisCache:
+    """LRU of nearby-zone candidates and analyses per (geohash cell, radius bucket).
+
+    A zone write evicts only the entries whose search circle contains the
+    zone's old or new position; everything else keeps being served from
+    memory, with per-request work limited to filtering the candidates.
+    """
+
+    def __init__(self, max_entries=LOCATION_CACHE_MAX_ENTRIES, fallback_ttl=LOCATION_FALLBACK_TTL):
+        self.max_entries = max_entries
+        self.fallback_ttl = fallback_ttl
+        self._entries = OrderedDict()   # (geohash, radius) -> _CellEntry
+        self._lock = threading.Lock()
+
+    def _entry(self, cell, load_candidates):
+        with self._lock:
+            entry = self._entries.get(cell.key)
+            if entry is not None:
+                self._entries.move_to_end(cell.key)
+                return entry
+
+        entry = _CellEntry(cell, load_candidates(cell.lat, cell.lng, cell.search_radius_km))
+        with self._lock:
+            self._entries[cell.key] = entry
+            self._entries.move_to_end(cell.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def nearby_zones(self, cell, lat, lng, radius_km, load_candidates):
+        """Zone dicts within radius_km of (lat, lng), nearest first, with distance_km.
+
+        load_candidates(lat, lng, radius_km) returns zone dicts (with lat
+        and lng) for the cell's search circle on a miss.
+        """
+        entry = self._entry(cell, load_candidates)
+        if not entry.candidates:
+            return []
+        distances = haversine_km(math.radians(lat), math.radians(lng), entry.coords[:, 0], entry.coords[:, 1])
+        within = np.nonzero(distances <= radius_km)[0]
+        order = within[np.argsort(distances[within], kind='stable')]
+        return [{**entry.candidates[i], 'distance_km': round(float(distances[i]), 2)} for i in order]
+
+    def analysis(self, cell, zone_ids, compute):
+        """Cached analysis for the cell and the zones it is based on, else compute().
+
+        compute returns (analysis, final); non-final analyses (fallback
+        answers) only live for fallback_ttl seconds.
+        """
+        with self._lock:
+            entry = self._entries.get(cell.key)
+            cached = entry.analyses.get(zone_ids) if entry is not None else None
+            if cached is not None and (cached[1] is None or cached[1] > time.monotonic()):
+                return cached[0]
+
+        analysis, final = compute()
+        if entry is not None:
+            with self._lock:
+                entry.analyses[zone_ids] = (analysis, None if final else time.monotonic() + self.fallback_ttl)
+        return analysis
+
+    def apply_zone_changes(self, changes):
+        """Evict cells near the old or new position of every changed zone"""
+        positions = []
+        for op, row, previous in changes:
+            for lat, lng in ((row.get('lat'), row.get('lng')),
+                             (previous.get('lat', row.get('lat')), previous.get('lng', row.get('lng')))):
+                if lat is not None and lng is not None:
+                    positions.append((lat, lng))
+        with self._lock:
+            if not self._entries:
+                return
+            if not positions:
+                # A zone without coordinates can't be placed, so nothing is safe to keep
+                self._entries.clear()
+                return
+
+            keys = list(self._entries)
+            cells = [self._entries[key].cell for key in keys]
+            centres = np.radians([(cell.lat, cell.lng) for cell in cells])
+            reach = np.array([cell.search_radius_km for cell in cells], dtype=float)
+            points = np.radians(np.unique(np.asarray(positions, dtype=float), axis=0))
+
+            stale = np.zeros(len(keys), dtype=bool)
+            for lat, lng in points:
+                stale |= haversine_km(lat, lng, centres[:, 0], centres[:, 1]) <= reach
+            for index in np.flatnonzero(stale):
+                del self._entries[keys[index]]
+
+    def __len__(self):
+        return len(self._entries)
+
+location_cache = LocationAnalysisCache()
+model_events.subscribe(Zone, location_cache.apply_zone_changes)
@@ -0,0 +1,93 @@
+from src.models.zone import Zone, Event
+from src.services import model_events
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MARKET_INSIGHTS_REFRESH_INTERVAL = float(os.getenv('MARKET_INSIGHTS_REFRESH_INTERVAL', 15 * 60))
+# Bursts of event writes (e.g. an ingest run) trigger one regeneration
+MARKET_INSIGHTS_DEBOUNCE = float(os.getenv('MARKET_INSIGHTS_DEBOUNCE', 5))
+
+class MarketInsightsSnapshot:
+    """One generated insights payload, pre-serialized with its ETag"""
+
+    def __init__(self, version, data):
+        self.version = version
+        self.data = data
+        self.generated_at = datetime.utcnow()
+        self.body = json.dumps({'success': True, 'data': data}, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        self.etag = f'{version}-' + hashlib.sha256(self.body).hexdigest()[:16]
+
+class MarketInsightsScheduler:
+    """Regenerates market insights in a background thread.
+
+    A refresh runs every interval seconds and shortly after zone or event
+    changes; requests only ever read the latest snapshot, so their latency
+    never includes the LLM call.
+    """
+
+    def __init__(self, interval=MARKET_INSIGHTS_REFRESH_INTERVAL, debounce=MARKET_INSIGHTS_DEBOUNCE):
+        self.interval = interval
+        self.debounce = debounce
+        self._builder = None
+        self._snapshot = None
+        self._version = 0
+        self._app = None
+        self._thread = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def builder(self, fn):
+        """Register fn(use_ai) returning the insights dict"""
+        self._builder = fn
+        return fn
+
+    def current(self):
+        return self._snapshot
+
+    def publish(self, data, only_if_empty=False):
+        """Install data as the new snapshot (or keep an existing one when only_if_empty)"""
+        with self._lock:
+            if not (only_if_empty and self._snapshot is not None):
+                self._version += 1
+                self._snapshot = MarketInsightsSnapshot(self._version, data)
+            return self._snapshot
+
+    def refresh(self, use_ai=True):
+        """Build and publish a new snapshot in the calling thread (needs an app context)"""
+        return self.publish(self._builder(use_ai))
+
+    def request_refresh(self, changes=None):
+        self._wake.set()
+
+    def ensure_started(self, app):
+        """Start the scheduler thread once; the first refresh runs immediately"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._app = app
+            self._thread = threading.Thread(target=self._run, name='market-insights', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                with self._app.app_context():
+                    self.refresh()
+            except Exception:
+                logger.exception('market insights refresh failed')
+
+            if self._wake.wait(self.interval):
+                self._wake.clear()
+                time.sleep(self.debounce)  # let the rest of a write burst arrive
+                self._wake.clear()
+
+market_insights = MarketInsightsScheduler()
+model_events.subscribe(Event, market_insights.request_refresh)
+model_events.subscribe(Zone, market_insights.request_refresh)
@@ -0,0 +1,74 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from collections import defaultdict
+import logging
+
+logger = logging.getLogger(__name__)
+
+# table name -> callbacks interested in committed changes to that table
+_subscribers = defaultdict(list)
+_tracked_models = set()
+
+PENDING_KEY = 'model_events_pending'
+
+def subscribe(model, callback):
+    """Call callback(changes) after every commit touching rows of model.
+
+    changes is a list of (op, row, previous) tuples where op is 'insert',
+    'update' or 'delete', row is a plain dict of the column values at flush
+    time and previous holds the old values of the columns an update changed
+    (empty otherwise), so callbacks never need to touch the (already
+    expired) ORM instances.
+    """
+    _subscribers[model.__tablename__].append(callback)
+    if model not in _tracked_models:
+        _tracked_models.add(model)
+        for op in ('insert', 'update', 'delete'):
+            event.listen(model, f'after_{op}', _make_recorder(op))
+
+def publish(table_name, changes):
+    """Deliver changes made outside the ORM (e.g. Core bulk writes)"""
+    if not changes:
+        return
+    for callback in _subscribers.get(table_name, []):
+        try:
+            callback(changes)
+        except Exception:
+            logger.exception('change subscriber for %s failed', table_name)
+
+def snapshot_row(target):
+    """Copy the column values of an ORM instance into a plain dict"""
+    state = inspect(target)
+    return {attr.key: getattr(target, attr.key) for attr in state.mapper.column_attrs}
+
+def previous_values(target):
+    """Old values of the columns changed on target in the current flush"""
+    state = inspect(target)
+    previous = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if history.deleted:
+            previous[attr.key] = history.deleted[0]
+    return previous
+
+def _make_recorder(op):
+    def record(mapper, connection, target):
+        session = inspect(target).session
+        if session is None:
+            return
+        previous = previous_values(target) if op == 'update' else {}
+        pending = session.info.setdefault(PENDING_KEY, defaultdict(list))
+        pending[mapper.local_table.name].append((op, snapshot_row(target), previous))
+    return record
+
+@event.listens_for(Session, 'after_commit')
+def _deliver_pending(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    for table_name, changes in pending.items():
+        publish(table_name, changes)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,67 @@
+from flask import Response, request, stream_with_context
+import base64
+import json
+import os
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Rows fetched from the database cursor per round trip when streaming
+STREAM_BATCH_SIZE = 500
+
+# Largest page a client can ask for with ?limit=
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 1000))
+
+class InvalidCursor(ValueError):
+    pass
+
+class InvalidPageSize(ValueError):
+    pass
+
+def parse_page_size(name):
+    """Query parameter name as a page size capped at MAX_PAGE_SIZE; None when absent"""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if size < 1:
+        raise InvalidPageSize(f'{name} must be a positive integer')
+    return min(size, MAX_PAGE_SIZE)
+
+def encode_cursor(*values):
+    """Opaque keyset cursor for the last row of a page"""
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor, size):
+    """Decode a cursor produced by encode_cursor into a tuple of size values, the last being a row id"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor('Invalid cursor')
+    # Sort keys then the row id; anything else would reach the SQL comparison
+    *keys, row_id = values
+    if not _is_int(row_id) or not all(_is_int(key) or isinstance(key, (float, str)) for key in keys):
+        raise InvalidCursor('Invalid cursor')
+    return tuple(values)
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def wants_ndjson():
+    """True when the client prefers newline-delimited JSON over a JSON document"""
+    # Only an explicit NDJSON entry counts; */* keeps the JSON document
+    explicit = any(value == NDJSON_MIMETYPE and quality > 0 for value, quality in request.accept_mimetypes)
+    return explicit and request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def ndjson_response(rows):
+    """Stream an iterable of JSON-serializable rows, one per line"""
+    def generate():
+        for row in rows:
+            yield json.dumps(row, default=str) + '\n'
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,119 @@
+from src.models.investment import Product
+from src.models.user import db
+from src.services import model_events
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+
+# Seconds between checks for product writes made by other processes
+PRODUCT_CATALOG_CHECK_INTERVAL = float(os.getenv('PRODUCT_CATALOG_CHECK_INTERVAL', 1))
+# Rebuild at least this often, catching in-place updates made elsewhere
+PRODUCT_CATALOG_MAX_AGE = float(os.getenv('PRODUCT_CATALOG_MAX_AGE', 60))
+
+def _serialize(products):
+    """Response body bytes for a product list, matching the jsonify layout"""
+    body = {'success': True, 'data': products, 'count': len(products)}
+    return json.dumps(body, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def _render(products):
+    body = _serialize(products)
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+class ProductCatalogSnapshot:
+    """Immutable view of the products table with every filter pre-rendered.
+
+    Responses for each (category, risk) combination, including the
+    unfiltered ones, are serialized once when the snapshot is built, so
+    serving /products is a dict lookup. Each body carries a content-hash
+    ETag; version identifies the catalog as a whole.
+    """
+
+    def __init__(self, products):
+        self.products = tuple(products)
+        self.categories = tuple(sorted({product['category'] for product in self.products}))
+        self.risks = tuple(sorted({product['risk'] for product in self.products}))
+
+        self.by_category = {
+            category: tuple(p for p in self.products if p['category'] == category)
+            for category in self.categories
+        }
+        self.by_risk = {
+            risk: tuple(p for p in self.products if p['risk'] == risk)
+            for risk in self.risks
+        }
+
+        self._responses = {}
+        for category, risk in itertools.product((None,) + self.categories, (None,) + self.risks):
+            matching = self.products if category is None else self.by_category[category]
+            if risk is not None:
+                matching = [p for p in matching if p['risk'] == risk]
+            self._responses[(category, risk)] = _render(list(matching))
+
+        self.version = self._responses[(None, None)][1]
+        self._empty_response = _render([])
+
+    def response_for(self, category=None, risk=None):
+        """(body bytes, etag) for the products matching the filters"""
+        return self._responses.get((category, risk), self._empty_response)
+
+class ProductCatalog:
+    """Holds the current snapshot and swaps in a new one after product writes.
+
+    In-process writes invalidate through model_events. Writes from other
+    processes (seed_data.py, a second worker) are caught by comparing a
+    cheap (count, max id) fingerprint at most every check_interval
+    seconds, and in-place updates by rebuilding after max_age seconds.
+    """
+
+    def __init__(self, check_interval=PRODUCT_CATALOG_CHECK_INTERVAL, max_age=PRODUCT_CATALOG_MAX_AGE):
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._snapshot = None
+        self._fingerprint = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self, changes=None):
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def _is_stale(self):
+        now = time.monotonic()
+        if now - self._built_at >= self.max_age:
+            return True
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        return _fingerprint() != self._fingerprint
+
+    def current(self):
+        snapshot = self._snapshot
+        if snapshot is not None and not self._is_stale():
+            return snapshot
+
+        with self._lock:
+            generation = self._generation
+        fingerprint = _fingerprint()
+        products = [product.to_dict() for product in Product.query.order_by(Product.id)]
+        snapshot = ProductCatalogSnapshot(products)
+
+        with self._lock:
+            # A write committed while we were reading: serve this build once,
+            # but let the next request rebuild from the newer table
+            if generation == self._generation:
+                self._snapshot = snapshot
+                self._fingerprint = fingerprint
+                self._built_at = self._checked_at = time.monotonic()
+        return snapshot
+
+def _fingerprint():
+    return tuple(db.session.execute(db.select(db.func.count(Product.id), db.func.max(Product.id))).one())
+
+product_catalog = ProductCatalog()
+model_events.subscribe(Product, product_catalog.invalidate)
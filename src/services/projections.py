@@ -0,0 +1,137 @@
+from src.models.investment import Projection
+import numpy as np
+import json
+import os
+
+# Annual expected return and volatility (%) per allocation bucket
+ASSET_ASSUMPTIONS = {
+    'index_funds': (11.0, 16.0),
+    'flexi_cap': (13.0, 20.0),
+    'debt_funds': (7.0, 3.0),
+    'reits': (9.0, 14.0),
+    'gold_etf': (8.0, 15.0),
+    'other': (8.0, 12.0)
+}
+ASSET_CLASSES = list(ASSET_ASSUMPTIONS)
+
+# Correlation of annual returns, in ASSET_CLASSES order
+ASSET_CORRELATIONS = np.array([
+    [1.0, 0.9, 0.1, 0.5, -0.1, 0.6],
+    [0.9, 1.0, 0.1, 0.5, -0.1, 0.6],
+    [0.1, 0.1, 1.0, 0.2, 0.1, 0.2],
+    [0.5, 0.5, 0.2, 1.0, 0.0, 0.4],
+    [-0.1, -0.1, 0.1, 0.0, 1.0, 0.1],
+    [0.6, 0.6, 0.2, 0.4, 0.1, 1.0]
+])
+
+# Stress regime: lower returns, higher volatility
+STRESS_RETURN_FACTOR = 0.5
+STRESS_VOLATILITY_FACTOR = 1.5
+
+DEFAULT_PATHS = 10000
+MAX_PATHS = 100000
+# Upper bound on paths x horizon months per regime; each cell is one float64 of working memory
+MAX_PATH_MONTHS = int(os.getenv('PROJECTION_MAX_PATH_MONTHS', 12000000))
+COVERAGE_PERCENTILES = (10, 90)
+
+def allocation_weights(allocation):
+    """Normalized weights in ASSET_CLASSES order; unknown buckets count as 'other'"""
+    weights = np.zeros(len(ASSET_CLASSES))
+    for bucket, percentage in (allocation or {}).items():
+        key = bucket if bucket in ASSET_ASSUMPTIONS else 'other'
+        weights[ASSET_CLASSES.index(key)] += max(float(percentage or 0), 0.0)
+    if weights.sum() == 0:
+        weights[ASSET_CLASSES.index('other')] = 1.0
+    return weights / weights.sum()
+
+def portfolio_return_params(weights, stress=False):
+    """Annual (mean, volatility) of a monthly-rebalanced portfolio, as fractions"""
+    means = np.array([ASSET_ASSUMPTIONS[key][0] for key in ASSET_CLASSES]) / 100
+    vols = np.array([ASSET_ASSUMPTIONS[key][1] for key in ASSET_CLASSES]) / 100
+    if stress:
+        means = means * STRESS_RETURN_FACTOR
+        vols = vols * STRESS_VOLATILITY_FACTOR
+    covariance = ASSET_CORRELATIONS * np.outer(vols, vols)
+    return float(weights @ means), float(np.sqrt(weights @ covariance @ weights))
+
+def simulate_final_corpus(monthly_amount, months, annual_mean, annual_vol, paths, rng):
+    """Final corpus per path for a fixed monthly contribution.
+
+    Monthly growth factors are lognormal; with L the cumulative log growth,
+    contributing c at the start of each month gives
+    V_T = c * sum_t exp(L_T - L_{t-1}), computed for all paths at once.
+    """
+    if months <= 0:
+        return np.zeros(paths)
+    monthly_mean = np.log1p(annual_mean) / 12
+    monthly_vol = annual_vol / np.sqrt(12)
+
+    log_growth = rng.standard_normal((paths, months))
+    log_growth *= monthly_vol
+    log_growth += monthly_mean - 0.5 * monthly_vol ** 2
+    np.cumsum(log_growth, axis=1, out=log_growth)
+
+    final = log_growth[:, -1].copy()
+    # exp(L_T - L_{t-1}) for t = 1..T, with L_0 = 0
+    log_growth[:, 1:] = final[:, None] - log_growth[:, :-1]
+    log_growth[:, 0] = final
+    np.exp(log_growth, out=log_growth)
+    return monthly_amount * log_growth.sum(axis=1)
+
+def simulate_coverage(allocation, monthly_amount, horizon_months, target_amount, paths=DEFAULT_PATHS, seed=None):
+    """Coverage percentiles (% of target reached) under base and stress regimes"""
+    weights = allocation_weights(allocation)
+    rng = np.random.default_rng(seed)
+    target = max(float(target_amount or 0), 1.0)
+
+    result = {}
+    for regime, stress in (('base', False), ('stress', True)):
+        annual_mean, annual_vol = portfolio_return_params(weights, stress)
+        corpus = simulate_final_corpus(monthly_amount, horizon_months, annual_mean, annual_vol, paths, rng)
+        coverage = corpus / target * 100
+        low, high = np.percentile(coverage, COVERAGE_PERCENTILES)
+        result[regime] = {
+            'coverage_min': int(round(low)),
+            'coverage_max': int(round(high)),
+            'coverage_median': round(float(np.median(coverage)), 2),
+            'probability_of_goal': round(float(np.mean(coverage >= 100)), 4),
+            'annual_return': round(annual_mean * 100, 2),
+            'annual_volatility': round(annual_vol * 100, 2)
+        }
+    return result
+
+def clamp_paths(paths):
+    return min(max(int(paths), 100), MAX_PATHS)
+
+def paths_within_limit(horizon_months, paths=DEFAULT_PATHS):
+    """Path count shrunk so paths x horizon_months fits MAX_PATH_MONTHS; None when even the minimum doesn't"""
+    paths = min(clamp_paths(paths), MAX_PATH_MONTHS // max(horizon_months, 1))
+    return paths if paths >= 100 else None
+
+def build_plan_projection(plan, goal, paths=DEFAULT_PATHS, seed=None):
+    """Simulate plan against its goal and return an unsaved Projection"""
+    allocation = json.loads(plan.allocation_json) if plan.allocation_json else {}
+    if seed is None:
+        seed = plan.id
+    paths = clamp_paths(paths)
+
+    result = simulate_coverage(allocation, plan.monthly_amount, goal.horizon_months, goal.target_amount, paths, seed)
+    base, stress = result['base'], result['stress']
+
+    assumptions = [
+        f"Monte Carlo: {paths} paths over {goal.horizon_months} months (seed {seed})",
+        f"Coverage range is the {COVERAGE_PERCENTILES[0]}th-{COVERAGE_PERCENTILES[1]}th percentile of corpus / target",
+        f"Base regime: {base['annual_return']}% return, {base['annual_volatility']}% volatility; "
+        f"median coverage {base['coverage_median']}%, goal reached in {base['probability_of_goal'] * 100:.1f}% of paths",
+        f"Stress regime: {stress['annual_return']}% return, {stress['annual_volatility']}% volatility; "
+        f"median coverage {stress['coverage_median']}%, goal reached in {stress['probability_of_goal'] * 100:.1f}% of paths"
+    ]
+
+    return Projection(
+        plan_id=plan.id,
+        base_coverage_min=base['coverage_min'],
+        base_coverage_max=base['coverage_max'],
+        stress_coverage_min=stress['coverage_min'],
+        stress_coverage_max=stress['coverage_max'],
+        assumptions=json.dumps(assumptions)
+    )
@@ -0,0 +1,239 @@
+from src.models.zone import Zone
+from src.models.user import db
+from src.services import model_events
+from collections import deque
+import re
+import threading
+
+# Below this share of explained words the caller should ask the LLM instead
+PARSER_CONFIDENCE_THRESHOLD = 0.6
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:\.[0-9]+)?')
+
+STOPWORDS = {
+    'a', 'an', 'the', 'in', 'at', 'near', 'around', 'for', 'of', 'to', 'with', 'and', 'or', 'i', 'me', 'my',
+    'want', 'looking', 'look', 'find', 'show', 'best', 'good', 'top', 'invest', 'investing', 'investment',
+    'investments', 'options', 'option', 'opportunities', 'place', 'places', 'area', 'areas', 'zone', 'zones',
+    'where', 'should', 'can', 'what', 'which', 'is', 'are', 'some', 'buy', 'budget', 'within', 'horizon',
+    'risk', 'return', 'returns', 'plan', 'money', 'rs', 'inr', 'please', 'city', 'state', 'time'
+}
+
+# Common alternate spellings -> name used in the zones table
+LOCATION_ALIASES = {
+    'bengaluru': 'bangalore',
+    'bombay': 'mumbai',
+    'gurugram': 'gurgaon',
+    'new delhi': 'delhi',
+    'madras': 'chennai',
+    'calcutta': 'kolkata',
+    'poona': 'pune'
+}
+
+INVESTMENT_TYPE_TERMS = {
+    'real_estate': ['real estate', 'property', 'properties', 'flat', 'flats', 'apartment', 'apartments',
+                    'house', 'home', 'homes', 'plot', 'plots', 'land', 'villa', 'commercial'],
+    'stocks': ['stock', 'stocks', 'equity', 'equities', 'share', 'shares'],
+    'sip': ['mutual fund', 'mutual funds', 'sip', 'sips', 'mf'],
+    'bonds': ['bond', 'bonds', 'fd', 'fixed deposit', 'debt'],
+    'gold': ['gold', 'sgb']
+}
+
+RISK_TERMS = {
+    'CONSERVATIVE': ['low risk', 'conservative', 'safe', 'safest', 'secure', 'stable'],
+    'MODERATE': ['moderate', 'balanced', 'medium risk'],
+    'GROWTH': ['high risk', 'aggressive', 'growth', 'high return', 'high returns']
+}
+
+AMOUNT_UNITS = {
+    'k': 1e3, 'thousand': 1e3,
+    'l': 1e5, 'lac': 1e5, 'lacs': 1e5, 'lakh': 1e5, 'lakhs': 1e5,
+    'cr': 1e7, 'crore': 1e7, 'crores': 1e7,
+    'million': 1e6, 'mn': 1e6
+}
+AMOUNT_UNIT = r'(k|thousand|lakhs?|lacs?|l|crores?|cr|million|mn)\b'
+AMOUNT = rf'(?:₹|rs\.?|inr)?\s*(\d+(?:\.\d+)?)\s*{AMOUNT_UNIT}'
+BUDGET_RANGE_PATTERN = re.compile(rf'(?:between\s+)?(?:₹|rs\.?|inr)?\s*(\d+(?:\.\d+)?)\s*(?:{AMOUNT_UNIT})?\s*(?:-|to|and)\s*{AMOUNT}')
+BUDGET_BOUND_PATTERN = re.compile(rf'(under|below|less than|upto|up to|within|max|maximum|above|over|more than|min|minimum|atleast|at least)?\s*{AMOUNT}')
+HORIZON_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(years?|yrs?|y|months?|mos?)\b')
+
+UPPER_BOUND_WORDS = {'under', 'below', 'less than', 'upto', 'up to', 'within', 'max', 'maximum'}
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over word tokens.
+
+    Phrases are token sequences, so matches always fall on word
+    boundaries; one left-to-right pass over the query finds every phrase.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+    def add(self, tokens, payload):
+        node = 0
+        for token in tokens:
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append((len(tokens), payload))
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        return self
+
+    def find(self, tokens):
+        """Yield (start, end, payload) for every phrase occurrence"""
+        node = 0
+        for position, token in enumerate(tokens):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for length, payload in self._out[node]:
+                yield position - length + 1, position + 1, payload
+
+# Preferred reading when one phrase names several things
+KIND_PRIORITY = {'zone': 0, 'city': 1, 'state': 2, 'investment_type': 3, 'risk': 3}
+
+class QueryParser:
+    """Rule-based interpretation of investment search queries.
+
+    The location automaton holds every zone name, city and state from the
+    zones table and is rebuilt lazily after zone changes.
+    """
+
+    def __init__(self):
+        self._automaton = None
+        self._lock = threading.Lock()
+
+    def invalidate(self, changes=None):
+        self._automaton = None
+
+    def _build(self):
+        automaton = PhraseAutomaton()
+        locations = {}
+        for name, city, state in db.session.query(Zone.name, Zone.city, Zone.state):
+            for kind, value in (('zone', name), ('city', city), ('state', state)):
+                if value:
+                    key = tuple(TOKEN_PATTERN.findall(value.lower()))
+                    if key and (key not in locations or KIND_PRIORITY[kind] < KIND_PRIORITY[locations[key][0]]):
+                        locations[key] = (kind, value)
+        for alias, target in LOCATION_ALIASES.items():
+            target_key = tuple(TOKEN_PATTERN.findall(target))
+            if target_key in locations:
+                locations.setdefault(tuple(TOKEN_PATTERN.findall(alias)), locations[target_key])
+
+        for key, payload in locations.items():
+            automaton.add(key, payload)
+        for investment_type, terms in INVESTMENT_TYPE_TERMS.items():
+            for term in terms:
+                automaton.add(tuple(term.split()), ('investment_type', investment_type))
+        for risk, terms in RISK_TERMS.items():
+            for term in terms:
+                automaton.add(tuple(term.split()), ('risk', risk))
+        return automaton.build()
+
+    def automaton(self):
+        automaton = self._automaton
+        if automaton is None:
+            with self._lock:
+                if self._automaton is None:
+                    self._automaton = self._build()
+                automaton = self._automaton
+        return automaton
+
+    def parse(self, query):
+        """Interpretation dict (LLM schema) plus a confidence in [0, 1]"""
+        text = (query or '').lower()
+        spans = [(match.start(), match.end()) for match in TOKEN_PATTERN.finditer(text)]
+        tokens = [text[start:end] for start, end in spans]
+        explained = [token in STOPWORDS for token in tokens]
+
+        def explain(char_start, char_end):
+            for index, (start, end) in enumerate(spans):
+                if start >= char_start and end <= char_end:
+                    explained[index] = True
+
+        budget_range = _extract_budget(text, explain)
+        time_horizon = _extract_horizon(text, explain)
+
+        # Longest phrases first, then leftmost, without overlaps
+        matches = sorted(self.automaton().find(tokens), key=lambda m: (-(m[1] - m[0]), m[0], KIND_PRIORITY[m[2][0]]))
+        taken = [False] * len(tokens)
+        found = {}
+        for start, end, (kind, value) in matches:
+            if any(taken[start:end]):
+                continue
+            for index in range(start, end):
+                taken[index] = explained[index] = True
+            found.setdefault(kind, []).append((start, value))
+
+        locations = sorted(
+            (KIND_PRIORITY[kind], start, value)
+            for kind in ('zone', 'city', 'state') for start, value in found.get(kind, [])
+        )
+
+        def first(kind):
+            return min(found[kind])[1] if kind in found else None
+
+        confidence = sum(explained) / len(tokens) if tokens else 0.0
+        if not locations and not found.get('investment_type') and budget_range is None and time_horizon is None:
+            confidence = min(confidence, PARSER_CONFIDENCE_THRESHOLD / 2)
+
+        return {
+            'location': locations[0][2] if locations else None,
+            'investment_type': first('investment_type'),
+            'budget_range': budget_range,
+            'time_horizon': time_horizon,
+            'risk_preference': first('risk')
+        }, round(confidence, 3)
+
+def _amount(number, unit):
+    return int(round(float(number) * AMOUNT_UNITS[unit]))
+
+def _extract_budget(text, explain):
+    """{'min': rupees, 'max': rupees} from '50 lakh to 1.2 cr', 'under 80 lakh', ..."""
+    match = BUDGET_RANGE_PATTERN.search(text)
+    if match:
+        low_number, low_unit, high_number, high_unit = match.groups()
+        high = _amount(high_number, high_unit)
+        low = _amount(low_number, low_unit or high_unit) if low_number else None
+        explain(*match.span())
+        return {'min': low, 'max': high}
+
+    match = BUDGET_BOUND_PATTERN.search(text)
+    if match:
+        bound, number, unit = match.groups()
+        amount = _amount(number, unit)
+        explain(*match.span())
+        if bound and bound not in UPPER_BOUND_WORDS:
+            return {'min': amount, 'max': None}
+        return {'min': None, 'max': amount}
+    return None
+
+def _extract_horizon(text, explain):
+    """Horizon in months from '5 years', '18 months', ..."""
+    match = HORIZON_PATTERN.search(text)
+    if not match:
+        return None
+    number, unit = match.groups()
+    explain(*match.span())
+    months = float(number) * (1 if unit.startswith('mo') else 12)
+    return int(round(months))
+
+query_parser = QueryParser()
+model_events.subscribe(Zone, query_parser.invalidate)
@@ -0,0 +1,155 @@
+from src.models.zone import Zone
+from src.models.user import db
+from datetime import datetime
+import numpy as np
+
+# Rules of perform_risk_assessment as lookup tables. Each categorical input
+# is encoded as an index into its table; a row holds the points it adds and
+# the bitmask of the risk factors it reports (bit = position in RISK_FACTORS,
+# which keeps the scalar function's reporting order).
+RISK_FACTORS = [
+    'Low confidence in zone outlook',
+    'Moderate confidence in zone performance',
+    'Zone has low growth outlook',
+    'Real estate liquidity constraints',
+    'High market volatility in equity investments',
+    'Short investment horizon increases risk',
+    'Long-term market uncertainty',
+    'Large investment amount concentration risk',
+    'Investment type misaligned with conservative risk profile'
+]
+
+# index 0 = no zone / any other value
+CONFIDENCE_TABLE = {'LOW': (20, 1 << 0), 'MEDIUM': (10, 1 << 1)}
+OUTLOOK_TABLE = {'LOW': (15, 1 << 2)}
+INVESTMENT_TYPE_TABLE = {'real_estate': (15, 1 << 3), 'stocks': (25, 1 << 4)}
+CONSERVATIVE_MISMATCH = (15, 1 << 8)
+MISALIGNED_TYPES = {'stocks', 'real_estate'}
+
+SHORT_HORIZON_MONTHS, SHORT_HORIZON = 36, (20, 1 << 5)
+LONG_HORIZON_MONTHS, LONG_HORIZON = 120, (5, 1 << 6)
+LARGE_AMOUNT, LARGE_AMOUNT_RISK = 5000000, (10, 1 << 7)
+
+# Upper score bound of each level, then the level above the last bound
+RISK_LEVEL_BOUNDS = [30, 60]
+RISK_LEVELS = [
+    ('LOW', 'Low risk investment with stable returns expected'),
+    ('MEDIUM', 'Moderate risk with balanced return potential'),
+    ('HIGH', 'High risk investment requiring careful monitoring')
+]
+
+DIVERSIFY_ABOVE_SCORE = 50
+DIVERSIFY_STRATEGIES = [
+    'Consider diversifying across multiple asset classes',
+    'Implement systematic investment approach to reduce timing risk',
+    'Regular portfolio review and rebalancing'
+]
+REIT_AMOUNT = 2000000
+REIT_STRATEGY = 'Consider REITs for better liquidity and diversification'
+
+def _compile(table):
+    """(code per key, points array, factor-bit array) with index 0 for unknown values"""
+    codes = {key: index + 1 for index, key in enumerate(table)}
+    points = np.array([0] + [value[0] for value in table.values()], dtype=np.int64)
+    bits = np.array([0] + [value[1] for value in table.values()], dtype=np.int64)
+    return codes, points, bits
+
+_CONFIDENCE = _compile(CONFIDENCE_TABLE)
+_OUTLOOK = _compile(OUTLOOK_TABLE)
+_INVESTMENT_TYPE = _compile(INVESTMENT_TYPE_TABLE)
+
+def _encode(values, compiled):
+    codes = compiled[0]
+    return np.fromiter((codes.get(value, 0) for value in values), dtype=np.int64, count=len(values))
+
+def _lookup(values, compiled):
+    encoded = _encode(values, compiled)
+    return compiled[1][encoded], compiled[2][encoded]
+
+def _where(condition, rule):
+    return np.where(condition, rule[0], 0), np.where(condition, rule[1], 0)
+
+def _zone_key(zone_id):
+    # JSON clients send ids as numbers or numeric strings; the single endpoint accepts both
+    if isinstance(zone_id, str) and zone_id.strip().isdigit():
+        return int(zone_id)
+    return zone_id
+
+def load_zone_ratings(zone_ids):
+    """{zone id: (confidence, outlook)} for the given ids in one IN query"""
+    zone_ids = list({_zone_key(zone_id) for zone_id in zone_ids if zone_id})
+    if not zone_ids:
+        return {}
+    rows = db.session.execute(
+        db.select(Zone.id, Zone.confidence, Zone.outlook).where(Zone.id.in_(zone_ids))
+    )
+    return {zone_id: (confidence, outlook) for zone_id, confidence, outlook in rows}
+
+def assess_risk_batch(scenarios):
+    """perform_risk_assessment for many scenarios at once.
+
+    scenarios are dicts with the /ai/risk-assessment request fields
+    (same defaults); zones referenced by zone_id are fetched in one
+    query. Returns the assessments in input order.
+    """
+    count = len(scenarios)
+    if not count:
+        return []
+
+    investment_types = [s.get('investment_type', 'real_estate') for s in scenarios]
+    amounts = np.array([s.get('amount', 1000000) for s in scenarios], dtype=float)
+    horizons = np.array([s.get('time_horizon', 60) for s in scenarios], dtype=float)
+    risk_profiles = [(s.get('user_profile') or {}).get('risk_profile', 'MODERATE') for s in scenarios]
+
+    zone_ids = [s.get('zone_id') for s in scenarios]
+    ratings = load_zone_ratings(zone_ids)
+    zone_ratings = [ratings.get(_zone_key(zone_id)) if zone_id else None for zone_id in zone_ids]
+    confidences = [rating[0] if rating else None for rating in zone_ratings]
+    outlooks = [rating[1] if rating else None for rating in zone_ratings]
+
+    mismatched = np.fromiter(
+        (profile == 'CONSERVATIVE' and investment_type in MISALIGNED_TYPES
+         for profile, investment_type in zip(risk_profiles, investment_types)),
+        dtype=bool, count=count
+    )
+    is_real_estate = np.fromiter((t == 'real_estate' for t in investment_types), dtype=bool, count=count)
+
+    parts = [
+        _lookup(confidences, _CONFIDENCE),
+        _lookup(outlooks, _OUTLOOK),
+        _lookup(investment_types, _INVESTMENT_TYPE),
+        _where(horizons < SHORT_HORIZON_MONTHS, SHORT_HORIZON),
+        _where(horizons > LONG_HORIZON_MONTHS, LONG_HORIZON),
+        _where(amounts > LARGE_AMOUNT, LARGE_AMOUNT_RISK),
+        _where(mismatched, CONSERVATIVE_MISMATCH)
+    ]
+    scores = sum(points for points, _ in parts)
+    masks = np.bitwise_or.reduce([bits for _, bits in parts])
+
+    levels = np.searchsorted(RISK_LEVEL_BOUNDS, scores, side='left')
+    # strategy set index: bit 0 = diversify, bit 1 = REIT
+    strategies = (scores > DIVERSIFY_ABOVE_SCORE).astype(np.int64) | ((is_real_estate & (amounts > REIT_AMOUNT)) << 1)
+    capped = np.minimum(scores, 100)
+
+    # Distinct factor combinations are few; expand each bitmask once
+    unique_masks, mask_index = np.unique(masks, return_inverse=True)
+    factor_lists = [[f for bit, f in enumerate(RISK_FACTORS) if mask >> bit & 1] for mask in unique_masks.tolist()]
+    strategy_lists = [
+        (DIVERSIFY_STRATEGIES if index & 1 else []) + ([REIT_STRATEGY] if index & 2 else [])
+        for index in range(4)
+    ]
+
+    assessment_date = datetime.utcnow().isoformat()
+    return [
+        {
+            'risk_score': score,
+            'risk_level': RISK_LEVELS[level][0],
+            'risk_description': RISK_LEVELS[level][1],
+            'risk_factors': list(factor_lists[factors]),
+            'mitigation_strategies': list(strategy_lists[strategy]),
+            'assessment_date': assessment_date
+        }
+        for score, level, factors, strategy in zip(
+            capped.tolist(), levels.tolist(), mask_index.tolist(), strategies.tolist()
+        )
+    ]
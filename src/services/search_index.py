@@ -0,0 +1,208 @@
+from src.models.zone import Zone, Event
+from src.models.investment import Product
+from src.models.user import db
+from src.services import model_events
+import numpy as np
+import json
+import math
+import re
+import threading
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOPWORDS = {
+    'a', 'an', 'the', 'in', 'at', 'of', 'to', 'for', 'and', 'or', 'on', 'with', 'by', 'is', 'are', 'be',
+    'from', 'as', 'near', 'me', 'i', 'my', 'want', 'show', 'find', 'best', 'good', 'top', 'under', 'over'
+}
+
+# doc type -> {column: weight}; a term's frequency counts weight times per occurrence
+DOC_FIELDS = {
+    'zone': {'name': 3, 'city': 2, 'state': 1},
+    'event': {'title': 2, 'description': 1},
+    'product': {'name': 3, 'category': 2, 'rationale_tags': 1}
+}
+DOC_TYPES = list(DOC_FIELDS)
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords, plurals folded ('funds' -> 'fund')"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall((text or '').lower().replace('_', ' ')):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def _field_text(doc_type, column, value):
+    if doc_type == 'product' and column == 'rationale_tags' and value:
+        try:
+            return ' '.join(json.loads(value))
+        except (TypeError, ValueError):
+            return value
+    return value
+
+def document_terms(doc_type, row):
+    """{term: weighted frequency} for a row dict of the given doc type"""
+    terms = {}
+    for column, weight in DOC_FIELDS[doc_type].items():
+        for token in tokenize(_field_text(doc_type, column, row.get(column))):
+            terms[token] = terms.get(token, 0) + weight
+    return terms
+
+class BM25Index:
+    """Incremental inverted index with BM25 ranking over zones, events and products.
+
+    Documents live in numbered slots (reused after deletes). Postings are
+    per-term {slot: tf} dicts; each term's BM25 contributions are computed
+    as numpy arrays on first use after a write, so a query adds a few
+    cached vectors and picks the top k with argpartition.
+    """
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._reset()
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def _reset(self):
+        self._slots = {}          # (doc type, id) -> slot
+        self._keys = []           # slot -> (doc type, id) or None when free
+        self._free = []
+        self._terms = []          # slot -> {term: tf}
+        self._lengths = np.zeros(0)
+        self._types = np.zeros(0, dtype=np.int8)
+        self._postings = {}       # term -> {slot: tf}
+        self._arrays = {}         # term -> (slots, BM25 contributions), valid for one generation
+        self._generation = 0      # bumped on every write: N and average length changed
+        self._total_length = 0.0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _load(self):
+        self._reset()
+        for doc_type, model in (('zone', Zone), ('event', Event), ('product', Product)):
+            columns = [model.id] + [getattr(model, column) for column in DOC_FIELDS[doc_type]]
+            for row in db.session.execute(db.select(*columns)).mappings():
+                self._add(doc_type, row)
+        self._loaded = True
+
+    def _grow(self):
+        capacity = max(1024, len(self._lengths) * 2)
+        self._lengths = np.resize(self._lengths, capacity)
+        self._types = np.resize(self._types, capacity)
+        self._lengths[len(self._keys):] = 0.0
+
+    def _add(self, doc_type, row):
+        key = (doc_type, row['id'])
+        self._remove(key)
+        terms = document_terms(doc_type, row)
+
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+            self._terms[slot] = terms
+        else:
+            slot = len(self._keys)
+            if slot >= len(self._lengths):
+                self._grow()
+            self._keys.append(key)
+            self._terms.append(terms)
+
+        length = float(sum(terms.values()))
+        self._slots[key] = slot
+        self._lengths[slot] = length
+        self._types[slot] = DOC_TYPES.index(doc_type)
+        self._total_length += length
+        self._generation += 1
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[slot] = tf
+
+    def _remove(self, key):
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        for term in self._terms[slot]:
+            postings = self._postings[term]
+            del postings[slot]
+            if not postings:
+                del self._postings[term]
+        self._generation += 1
+        self._total_length -= self._lengths[slot]
+        self._lengths[slot] = 0.0
+        self._keys[slot] = None
+        self._terms[slot] = {}
+        self._free.append(slot)
+
+    def _term_scores(self, term):
+        """(slots, BM25 contribution per slot) for term, cached until the next write"""
+        cached = self._arrays.get(term)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1], cached[2]
+
+        postings = self._postings[term]
+        slots = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+        tfs = np.fromiter(postings.values(), dtype=float, count=len(postings))
+
+        count = len(self._slots)
+        df = len(slots)
+        idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * self._lengths[slots] / (self._total_length / count))
+        contributions = idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+        self._arrays[term] = (self._generation, slots, contributions)
+        return slots, contributions
+
+    def change_handler(self, doc_type):
+        """model_events callback applying committed rows of doc_type"""
+        def apply_changes(changes):
+            with self._lock:
+                if not self._loaded:
+                    return  # first search will load the current tables
+                for op, row, _ in changes:
+                    if op == 'delete':
+                        self._remove((doc_type, row['id']))
+                    else:
+                        self._add(doc_type, row)
+        return apply_changes
+
+    def search(self, query, k=20, doc_types=None):
+        """Return [(doc type, id, score)] best first for a free-text query"""
+        terms = set(tokenize(query))
+        k = max(int(k), 1)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            terms = [term for term in terms if term in self._postings]
+            if not terms or not self._slots:
+                return []
+
+            # matched[i] is the slot scored by scores[i]; order picks positions in both
+            if len(terms) == 1 and doc_types is None:
+                # Single term: the posting list already holds every non-zero score
+                matched, scores = self._term_scores(terms[0])
+                order = np.arange(len(matched))
+            else:
+                scores = np.zeros(len(self._keys))
+                for term in terms:
+                    slots, contributions = self._term_scores(term)
+                    scores[slots] += contributions
+                if doc_types is not None:
+                    allowed = np.isin(self._types[:len(self._keys)], [DOC_TYPES.index(t) for t in doc_types])
+                    scores[~allowed] = 0.0
+                matched = np.arange(len(scores))
+                order = np.flatnonzero(scores)
+
+            if len(order) > k:
+                order = order[np.argpartition(-scores[order], k - 1)[:k]]
+            order = order[np.argsort(-scores[order], kind='stable')]
+            return [(*self._keys[slot], float(scores[index])) for slot, index in zip(matched[order], order)]
+
+search_index = BM25Index()
+model_events.subscribe(Zone, search_index.change_handler('zone'))
+model_events.subscribe(Event, search_index.change_handler('event'))
+model_events.subscribe(Product, search_index.change_handler('product'))
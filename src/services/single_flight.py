@@ -0,0 +1,76 @@
+from collections import Counter
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution.
+
+    The first caller of do(key, fn) runs fn; callers arriving while it is
+    still running wait for that result (or exception) instead of running
+    fn themselves. Nothing is kept once the call finishes, so this only
+    merges overlapping calls; caching is the caller's business.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executed = Counter()    # label -> calls that ran fn
+        self._coalesced = Counter()   # label -> calls served by another caller's fn
+        self._max_waiters = 0
+
+    def do(self, key, fn, label='default'):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executed[label] += 1
+            else:
+                call.waiters += 1
+                self._coalesced[label] += 1
+                self._max_waiters = max(self._max_waiters, call.waiters)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self):
+        """Executed / coalesced counts overall and per label"""
+        with self._lock:
+            executed = dict(self._executed)
+            coalesced = dict(self._coalesced)
+            in_flight = len(self._calls)
+            max_waiters = self._max_waiters
+        total_executed = sum(executed.values())
+        total_coalesced = sum(coalesced.values())
+        calls = total_executed + total_coalesced
+        return {
+            'executed': total_executed,
+            'coalesced': total_coalesced,
+            'coalesced_ratio': round(total_coalesced / calls, 4) if calls else None,
+            'in_flight': in_flight,
+            'max_waiters': max_waiters,
+            'by_label': {
+                label: {'executed': executed.get(label, 0), 'coalesced': coalesced.get(label, 0)}
+                for label in sorted(set(executed) | set(coalesced))
+            }
+        }
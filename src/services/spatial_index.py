@@ -0,0 +1,120 @@
+from src.models.zone import Zone
+from src.models.user import db
+from src.services import model_events
+import numpy as np
+import math
+import threading
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+class ZoneGridIndex:
+    """In-memory lat/lng grid over zone coordinates.
+
+    Zones are bucketed into fixed-size degree cells, so a radius query only
+    visits the cells overlapping the radius' bounding box (O(cells + k))
+    instead of scanning the zones table. Candidates from those cells are then
+    refined with a vectorized haversine distance.
+    """
+
+    def __init__(self, cell_size_deg=0.5):
+        self.cell_size_deg = cell_size_deg
+        self._cells = {}        # (row, col) -> set of zone ids
+        self._positions = {}    # zone id -> (lat, lng)
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def _cell_for(self, lat, lng):
+        return (math.floor(lat / self.cell_size_deg), math.floor(lng / self.cell_size_deg))
+
+    def _load(self):
+        self._cells.clear()
+        self._positions.clear()
+        for zone_id, lat, lng in db.session.query(Zone.id, Zone.lat, Zone.lng):
+            self._put(zone_id, lat, lng)
+        self._loaded = True
+
+    def _put(self, zone_id, lat, lng):
+        self._remove(zone_id)
+        if lat is None or lng is None:
+            return
+        self._positions[zone_id] = (lat, lng)
+        self._cells.setdefault(self._cell_for(lat, lng), set()).add(zone_id)
+
+    def _remove(self, zone_id):
+        position = self._positions.pop(zone_id, None)
+        if position is None:
+            return
+        cell = self._cell_for(*position)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(zone_id)
+            if not members:
+                del self._cells[cell]
+
+    def apply_changes(self, changes):
+        """Apply committed zone changes from model_events"""
+        with self._lock:
+            if not self._loaded:
+                return  # first query will load the current table
+            for op, row, _ in changes:
+                if op == 'delete':
+                    self._remove(row['id'])
+                else:
+                    self._put(row['id'], row['lat'], row['lng'])
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def _candidates(self, lat, lng, radius_km):
+        """Zone ids and coordinates inside the radius' bounding box cells"""
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        max_abs_lat = min(abs(lat) + dlat, 89.9)
+        dlng = min(radius_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(max_abs_lat))), 180.0)
+
+        row_min, col_min = self._cell_for(lat - dlat, lng - dlng)
+        row_max, col_max = self._cell_for(lat + dlat, lng + dlng)
+
+        ids = []
+        if (row_max - row_min + 1) * (col_max - col_min + 1) <= len(self._cells):
+            for row in range(row_min, row_max + 1):
+                for col in range(col_min, col_max + 1):
+                    members = self._cells.get((row, col))
+                    if members:
+                        ids.extend(members)
+        else:
+            # Huge radius: walking the occupied cells is cheaper than the box
+            for (row, col), members in self._cells.items():
+                if row_min <= row <= row_max and col_min <= col <= col_max:
+                    ids.extend(members)
+
+        coords = [self._positions[zone_id] for zone_id in ids]
+        return ids, coords
+
+    def query_radius(self, lat, lng, radius_km):
+        """Return [(zone_id, distance_km)] within radius_km, nearest first"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            ids, coords = self._candidates(lat, lng, radius_km)
+
+        if not ids:
+            return []
+
+        points = np.radians(np.asarray(coords, dtype=float))
+        distances = haversine_km(math.radians(lat), math.radians(lng), points[:, 0], points[:, 1])
+
+        within = np.nonzero(distances <= radius_km)[0]
+        order = within[np.argsort(distances[within], kind='stable')]
+        return [(ids[i], float(distances[i])) for i in order]
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in km; all angles in radians, arrays broadcast"""
+    dlat = lat2 - lat1
+    dlng = lng2 - lng1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+zone_index = ZoneGridIndex()
+model_events.subscribe(Zone, zone_index.apply_changes)
@@ -0,0 +1,170 @@
+from src.models.zone import Zone
+from src.models.user import db
+from src.services import model_events
+from collections import Counter
+import math
+import threading
+
+MAX_ZOOM = 16
+# Each map tile is split into 2^CELL_SUBDIVISION x 2^CELL_SUBDIVISION cluster cells
+CELL_SUBDIVISION = 2
+MAX_MERCATOR_LAT = 85.05112878
+
+OUTLOOK_PRIORITY = {'HIGH': 3, 'MODERATE': 2, 'LOW': 1}
+
+class _Cluster:
+    """Running aggregate of the zones inside one cell of one zoom level"""
+
+    __slots__ = ('members', 'sum_lat', 'sum_lng', 'outlooks', '_best_rank')
+
+    def __init__(self):
+        self.members = {}       # zone id -> rank
+        self.sum_lat = 0.0
+        self.sum_lng = 0.0
+        self.outlooks = Counter()
+        self._best_rank = None
+
+    def add(self, zone_id, lat, lng, rank, outlook):
+        self.members[zone_id] = rank
+        self.sum_lat += lat
+        self.sum_lng += lng
+        self.outlooks[outlook] += 1
+        if self._best_rank is not None and rank < self._best_rank:
+            self._best_rank = rank
+        elif len(self.members) == 1:
+            self._best_rank = rank
+
+    def remove(self, zone_id, lat, lng, rank, outlook):
+        del self.members[zone_id]
+        self.sum_lat -= lat
+        self.sum_lng -= lng
+        self.outlooks[outlook] -= 1
+        if not self.outlooks[outlook]:
+            del self.outlooks[outlook]
+        if rank == self._best_rank:
+            self._best_rank = None  # recomputed on next read
+
+    @property
+    def best_rank(self):
+        if self._best_rank is None and self.members:
+            self._best_rank = min(self.members.values())
+        return self._best_rank
+
+    def to_dict(self, key):
+        count = len(self.members)
+        data = {
+            'key': key,
+            'count': count,
+            'lat': round(self.sum_lat / count, 6),
+            'lng': round(self.sum_lng / count, 6),
+            'best_rank': self.best_rank,
+            'dominant_outlook': max(self.outlooks, key=lambda o: (self.outlooks[o], OUTLOOK_PRIORITY.get(o, 0)))
+        }
+        if count == 1:
+            data['zone_id'] = next(iter(self.members))
+        return data
+
+class ZoneClusterPyramid:
+    """Per-zoom grid of zone clusters, maintained incrementally.
+
+    Every zone sits in exactly one cell per zoom level. Adding, moving or
+    removing a zone touches MAX_ZOOM + 1 cells, and a viewport query only
+    reads the cells intersecting the requested bounding box.
+    """
+
+    def __init__(self, max_zoom=MAX_ZOOM):
+        self.max_zoom = max_zoom
+        self._levels = [dict() for _ in range(max_zoom + 1)]  # zoom -> {(x, y): _Cluster}
+        self._zones = {}  # zone id -> (lat, lng, rank, outlook)
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _grid_size(zoom):
+        return 2 ** (zoom + CELL_SUBDIVISION)
+
+    @classmethod
+    def _cell_x(cls, lng, zoom):
+        n = cls._grid_size(zoom)
+        return min(max(int((lng + 180.0) / 360.0 * n), 0), n - 1)
+
+    @classmethod
+    def _cell_y(cls, lat, zoom):
+        n = cls._grid_size(zoom)
+        lat = min(max(lat, -MAX_MERCATOR_LAT), MAX_MERCATOR_LAT)
+        lat_rad = math.radians(lat)
+        y = (1.0 - math.log(math.tan(lat_rad) + 1.0 / math.cos(lat_rad)) / math.pi) / 2.0 * n
+        return min(max(int(y), 0), n - 1)
+
+    def _load(self):
+        for level in self._levels:
+            level.clear()
+        self._zones.clear()
+        for zone_id, lat, lng, rank, outlook in db.session.query(Zone.id, Zone.lat, Zone.lng, Zone.rank, Zone.outlook):
+            self._add(zone_id, lat, lng, rank, outlook)
+        self._loaded = True
+
+    def _add(self, zone_id, lat, lng, rank, outlook):
+        if lat is None or lng is None:
+            return
+        self._zones[zone_id] = (lat, lng, rank, outlook)
+        for zoom, level in enumerate(self._levels):
+            cell = (self._cell_x(lng, zoom), self._cell_y(lat, zoom))
+            cluster = level.get(cell)
+            if cluster is None:
+                cluster = level[cell] = _Cluster()
+            cluster.add(zone_id, lat, lng, rank, outlook)
+
+    def _remove(self, zone_id):
+        previous = self._zones.pop(zone_id, None)
+        if previous is None:
+            return
+        lat, lng, rank, outlook = previous
+        for zoom, level in enumerate(self._levels):
+            cell = (self._cell_x(lng, zoom), self._cell_y(lat, zoom))
+            cluster = level[cell]
+            cluster.remove(zone_id, lat, lng, rank, outlook)
+            if not cluster.members:
+                del level[cell]
+
+    def apply_changes(self, changes):
+        """Apply committed zone changes from model_events"""
+        with self._lock:
+            if not self._loaded:
+                return  # first query will load the current table
+            for op, row, _ in changes:
+                self._remove(row['id'])
+                if op != 'delete':
+                    self._add(row['id'], row['lat'], row['lng'], row['rank'], row['outlook'])
+
+    def query(self, zoom, bbox=None):
+        """Clusters at zoom intersecting bbox (min_lng, min_lat, max_lng, max_lat)"""
+        zoom = min(max(int(zoom), 0), self.max_zoom)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            level = self._levels[zoom]
+
+            if bbox is None:
+                cells = list(level.items())
+            else:
+                min_lng, min_lat, max_lng, max_lat = bbox
+                x_min, x_max = self._cell_x(min_lng, zoom), self._cell_x(max_lng, zoom)
+                y_min, y_max = self._cell_y(max_lat, zoom), self._cell_y(min_lat, zoom)
+                if (x_max - x_min + 1) * (y_max - y_min + 1) <= len(level):
+                    cells = [
+                        ((x, y), level[(x, y)])
+                        for x in range(x_min, x_max + 1)
+                        for y in range(y_min, y_max + 1)
+                        if (x, y) in level
+                    ]
+                else:
+                    cells = [
+                        (cell, cluster) for cell, cluster in level.items()
+                        if x_min <= cell[0] <= x_max and y_min <= cell[1] <= y_max
+                    ]
+
+            return [cluster.to_dict(f'{zoom}/{x}/{y}') for (x, y), cluster in cells]
+
+zone_clusters = ZoneClusterPyramid()
+model_events.subscribe(Zone, zone_clusters.apply_changes)
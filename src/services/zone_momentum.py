@@ -0,0 +1,138 @@
+from src.models.zone import Zone, Event, ZoneMomentum
+from src.models.user import db
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import date, datetime
+import math
+
+# Event impact halves every MOMENTUM_HALF_LIFE_DAYS after its anchor date
+MOMENTUM_HALF_LIFE_DAYS = 180
+DECAY_PER_DAY = math.log(2) / MOMENTUM_HALF_LIFE_DAYS
+
+# Scores are stored relative to a fixed epoch so that decay applies to every
+# zone equally: ordering by the stored value is ordering by current momentum
+MOMENTUM_EPOCH = date(2020, 1, 1)
+
+STATUS_WEIGHTS = {
+    'ANNOUNCED': 0.5,
+    'IN_PROGRESS': 0.8,
+    'COMPLETED': 1.0
+}
+
+_table = ZoneMomentum.__table__
+
+def event_contribution(start_date, created_at, expected_impact_bps, status):
+    """Epoch-scaled momentum contribution of one event.
+
+    Decay runs from the event's start date, or from when it was recorded if
+    it starts in the future, so announced projects count at full weight
+    until they begin to age.
+    """
+    if expected_impact_bps is None or start_date is None:
+        return 0.0
+    if isinstance(start_date, datetime):
+        start_date = start_date.date()
+    recorded = (created_at or datetime.utcnow()).date()
+    anchor = min(start_date, recorded)
+    weight = STATUS_WEIGHTS.get(status, STATUS_WEIGHTS['ANNOUNCED'])
+    return weight * expected_impact_bps * math.exp(DECAY_PER_DAY * (anchor - MOMENTUM_EPOCH).days)
+
+def momentum_score(weighted_impact, now=None):
+    """Current momentum (bps) from a stored epoch-scaled weighted_impact"""
+    if not weighted_impact:
+        return 0.0
+    now = now or datetime.utcnow()
+    days = (now - datetime.combine(MOMENTUM_EPOCH, datetime.min.time())).total_seconds() / 86400
+    return round(weighted_impact * math.exp(-DECAY_PER_DAY * days), 2)
+
+def _add_to_zone(connection, zone_id, delta):
+    if zone_id is None or not delta:
+        return
+    stmt = sqlite_insert(_table).values(zone_id=zone_id, weighted_impact=delta, updated_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_table.c.zone_id],
+        set_={
+            'weighted_impact': _table.c.weighted_impact + stmt.excluded.weighted_impact,
+            'updated_at': stmt.excluded.updated_at
+        }
+    )
+    connection.execute(stmt)
+
+def apply_momentum_deltas(connection, deltas):
+    """Add {zone_id: delta} to stored momentum (for writes that bypass the ORM)"""
+    for zone_id, delta in deltas.items():
+        _add_to_zone(connection, zone_id, delta)
+
+def _current(target):
+    return event_contribution(target.start_date, target.created_at, target.expected_impact_bps, target.status)
+
+def _previous(target):
+    state = inspect(target)
+    values = {}
+    for key in ('zone_id', 'start_date', 'created_at', 'expected_impact_bps', 'status'):
+        history = state.attrs[key].history
+        values[key] = history.deleted[0] if history.deleted else getattr(target, key)
+    zone_id = values.pop('zone_id')
+    return zone_id, event_contribution(**values)
+
+# Load previous values on assignment so updates can subtract the old contribution
+for _attr in (Event.zone_id, Event.start_date, Event.expected_impact_bps, Event.status):
+    event.listen(_attr, 'set', lambda target, value, oldvalue, initiator: None, active_history=True)
+
+@event.listens_for(Event, 'after_insert')
+def _event_inserted(mapper, connection, target):
+    _add_to_zone(connection, target.zone_id, _current(target))
+
+@event.listens_for(Event, 'after_update')
+def _event_updated(mapper, connection, target):
+    old_zone_id, old_contribution = _previous(target)
+    new_contribution = _current(target)
+    if old_zone_id == target.zone_id:
+        _add_to_zone(connection, target.zone_id, new_contribution - old_contribution)
+    else:
+        _add_to_zone(connection, old_zone_id, -old_contribution)
+        _add_to_zone(connection, target.zone_id, new_contribution)
+
+@event.listens_for(Event, 'after_delete')
+def _event_deleted(mapper, connection, target):
+    old_zone_id, old_contribution = _previous(target)
+    _add_to_zone(connection, old_zone_id, -old_contribution)
+
+@event.listens_for(Zone, 'after_delete')
+def _zone_deleted(mapper, connection, target):
+    connection.execute(_table.delete().where(_table.c.zone_id == target.id))
+
+def refresh_zone_momentum(connection, zone_ids=None):
+    """Recompute weighted_impact from the events table for zone_ids (or all zones)"""
+    events = Event.__table__
+    query = db.select(
+        events.c.zone_id, events.c.start_date, events.c.created_at,
+        events.c.expected_impact_bps, events.c.status
+    )
+    delete = _table.delete()
+    if zone_ids is not None:
+        zone_ids = list(zone_ids)
+        query = query.where(events.c.zone_id.in_(zone_ids))
+        delete = delete.where(_table.c.zone_id.in_(zone_ids))
+
+    totals = {}
+    for row in connection.execute(query):
+        totals[row.zone_id] = totals.get(row.zone_id, 0.0) + event_contribution(
+            row.start_date, row.created_at, row.expected_impact_bps, row.status
+        )
+
+    connection.execute(delete)
+    now = datetime.utcnow()
+    if totals:
+        connection.execute(_table.insert(), [
+            {'zone_id': zone_id, 'weighted_impact': total, 'updated_at': now}
+            for zone_id, total in totals.items()
+        ])
+
+def init_zone_momentum():
+    """Backfill momentum for databases created before the table existed"""
+    with db.engine.begin() as connection:
+        has_scores = connection.execute(db.select(_table.c.zone_id).limit(1)).first() is not None
+        has_events = connection.execute(db.select(Event.__table__.c.id).limit(1)).first() is not None
+        if has_events and not has_scores:
+            refresh_zone_momentum(connection)
@@ -0,0 +1,107 @@
+from src.models.zone import Zone
+from src.models.user import db
+from sqlalchemy import text
+import re
+
+# External-content FTS5 index over zones; triggers keep it in step with the
+# zones table for every insert, update and delete (ORM or raw SQL).
+FTS_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS zones_fts USING fts5(
+        name, city, state,
+        content='zones', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS zones_fts_ai AFTER INSERT ON zones BEGIN
+        INSERT INTO zones_fts(rowid, name, city, state) VALUES (new.id, new.name, new.city, new.state);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS zones_fts_ad AFTER DELETE ON zones BEGIN
+        INSERT INTO zones_fts(zones_fts, rowid, name, city, state) VALUES ('delete', old.id, old.name, old.city, old.state);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS zones_fts_au AFTER UPDATE OF name, city, state ON zones BEGIN
+        INSERT INTO zones_fts(zones_fts, rowid, name, city, state) VALUES ('delete', old.id, old.name, old.city, old.state);
+        INSERT INTO zones_fts(rowid, name, city, state) VALUES (new.id, new.name, new.city, new.state);
+    END""",
+]
+
+# bm25 column weights for name, city, state
+FTS_RANK = 'bm25(zones_fts, 10.0, 5.0, 2.0)'
+
+SEARCH_COLUMNS = ('name', 'city', 'state')
+
+_fts_enabled = False
+
+def init_zone_search():
+    """Create the FTS index and triggers if the database supports FTS5"""
+    global _fts_enabled
+    _fts_enabled = False
+    if db.engine.dialect.name != 'sqlite':
+        return
+
+    try:
+        with db.engine.begin() as conn:
+            existed = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'zones_fts'"
+            )).first() is not None
+            for statement in FTS_SCHEMA:
+                conn.execute(text(statement))
+            if not existed:
+                # Index rows that were in the table before the triggers existed
+                conn.execute(text("INSERT INTO zones_fts(zones_fts) VALUES ('rebuild')"))
+        _fts_enabled = True
+    except Exception:
+        # SQLite built without FTS5 - search_zone_ids falls back to LIKE
+        _fts_enabled = False
+
+def build_match_expression(query, columns=SEARCH_COLUMNS):
+    """Turn free text into an FTS5 prefix query, e.g. 'navi mum' -> "navi"* "mumbai"*"""
+    tokens = re.findall(r'\w+', query.lower())
+    if not tokens:
+        return None
+    terms = ' '.join(f'"{token}"*' for token in tokens)
+    return f"{{{' '.join(columns)}}} : ({terms})"
+
+def search_zone_ids(query, limit=None, columns=SEARCH_COLUMNS):
+    """Zone ids matching query in the given columns, best match first"""
+    if not _fts_enabled:
+        return _search_zone_ids_like(query, limit, columns)
+
+    match = build_match_expression(query, columns)
+    if match is None:
+        return []
+
+    sql = f"SELECT rowid FROM zones_fts WHERE zones_fts MATCH :match ORDER BY {FTS_RANK}"
+    params = {'match': match}
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params['limit'] = limit
+    return [row[0] for row in db.session.execute(text(sql), params)]
+
+def zone_search_filter(query, columns=SEARCH_COLUMNS):
+    """WHERE clause restricting Zone to matches of query, evaluated inside the database"""
+    if not _fts_enabled:
+        return _like_filter(query, columns)
+
+    match = build_match_expression(query, columns)
+    if match is None:
+        return db.false()
+
+    matching_ids = text("SELECT rowid FROM zones_fts WHERE zones_fts MATCH :match").bindparams(
+        match=match
+    ).columns(rowid=db.Integer)
+    return Zone.id.in_(matching_ids)
+
+def _like_filter(query, columns):
+    return db.or_(*[getattr(Zone, column).ilike(f'%{query}%') for column in columns])
+
+def _search_zone_ids_like(query, limit, columns):
+    """Substring match for databases without FTS5"""
+    zone_query = db.session.query(Zone.id).filter(_like_filter(query, columns)).order_by(Zone.rank, Zone.id)
+    if limit is not None:
+        zone_query = zone_query.limit(limit)
+    return [row[0] for row in zone_query]
+
+def load_zones_in_order(zone_ids):
+    """Fetch zones by id, preserving the order of zone_ids"""
+    if not zone_ids:
+        return []
+    zones_by_id = {zone.id: zone for zone in Zone.query.filter(Zone.id.in_(zone_ids))}
+    return [zones_by_id[zone_id] for zone_id in zone_ids if zone_id in zones_by_id]
@@ -0,0 +1,198 @@
+from src.models.zone import Zone, Event
+from src.models.user import db
+from src.services import model_events
+import numpy as np
+import math
+import threading
+
+OUTLOOK_LEVELS = {'LOW': 0.0, 'MODERATE': 1.0, 'HIGH': 2.0}
+CONFIDENCE_LEVELS = {'LOW': 0.0, 'MEDIUM': 1.0, 'HIGH': 2.0}
+EVENT_TYPES = ['INFRA', 'POLICY', 'BUSINESS', 'DEMOGRAPHIC', 'MEGA_EVENT', 'OTHER']
+
+# Column layout: outlook, confidence, rank, event-type mix, log impact, x/y/z location
+FEATURE_WEIGHTS = np.array(
+    [1.0, 0.5, 1.0]
+    + [1.0 / math.sqrt(len(EVENT_TYPES))] * len(EVENT_TYPES)
+    + [1.0]
+    + [1.0 / math.sqrt(3)] * 3
+)
+FEATURE_COUNT = len(FEATURE_WEIGHTS)
+
+# Above this many changed zones a full reload beats per-zone refreshes
+FULL_RELOAD_FRACTION = 0.25
+REFRESH_CHUNK_SIZE = 500
+
+def zone_features(zone, type_counts, total_impact_bps):
+    """Raw (unscaled) feature vector for one zone"""
+    features = np.zeros(FEATURE_COUNT)
+    features[0] = OUTLOOK_LEVELS.get(zone['outlook'], 1.0)
+    features[1] = CONFIDENCE_LEVELS.get(zone['confidence'], 1.0)
+    features[2] = zone['rank'] or 0
+
+    events_count = sum(type_counts.values())
+    if events_count:
+        for event_type, count in type_counts.items():
+            column = EVENT_TYPES.index(event_type if event_type in EVENT_TYPES else 'OTHER')
+            features[3 + column] += count / events_count
+
+    features[3 + len(EVENT_TYPES)] = math.copysign(math.log1p(abs(total_impact_bps)), total_impact_bps)
+
+    # Unit vector on the sphere so distance behaves the same at every latitude
+    lat, lng = math.radians(zone['lat'] or 0.0), math.radians(zone['lng'] or 0.0)
+    features[-3:] = (math.cos(lat) * math.cos(lng), math.cos(lat) * math.sin(lng), math.sin(lat))
+    return features
+
+class ZoneSimilarityIndex:
+    """Row-normalized zone feature matrix for cosine top-k lookups.
+
+    Raw features are kept per zone; zone and event commits only mark the
+    affected zones dirty. The next query refetches those zones in two
+    queries, then re-standardizes the whole matrix with numpy, so a lookup
+    is one matrix-vector product plus an argpartition.
+    """
+
+    def __init__(self):
+        self._ids = []          # matrix row -> zone id
+        self._rows = {}         # zone id -> matrix row
+        self._raw = np.zeros((0, FEATURE_COUNT))
+        self._matrix = None     # normalized copy of _raw, None when stale
+        self._dirty = set()
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def _fetch(self, zone_ids=None):
+        """{zone id: raw features} for zone_ids (all zones when None)"""
+        zones = db.select(Zone.id, Zone.outlook, Zone.confidence, Zone.rank, Zone.lat, Zone.lng)
+        events = db.select(
+            Event.zone_id, Event.type, db.func.count(Event.id), db.func.sum(Event.expected_impact_bps)
+        ).group_by(Event.zone_id, Event.type)
+        if zone_ids is not None:
+            zones = zones.where(Zone.id.in_(zone_ids))
+            events = events.where(Event.zone_id.in_(zone_ids))
+
+        type_counts = {}
+        impacts = {}
+        for zone_id, event_type, count, impact in db.session.execute(events):
+            type_counts.setdefault(zone_id, {})[event_type] = count
+            impacts[zone_id] = impacts.get(zone_id, 0) + (impact or 0)
+
+        return {
+            zone['id']: zone_features(zone, type_counts.get(zone['id'], {}), impacts.get(zone['id'], 0))
+            for zone in db.session.execute(zones).mappings()
+        }
+
+    def _load(self):
+        features = self._fetch()
+        self._ids = list(features)
+        self._rows = {zone_id: row for row, zone_id in enumerate(self._ids)}
+        self._raw = np.array(list(features.values())).reshape(len(self._ids), FEATURE_COUNT)
+        self._matrix = None
+        self._dirty.clear()
+        self._loaded = True
+
+    def _remove(self, zone_id):
+        row = self._rows.pop(zone_id, None)
+        if row is None:
+            return
+        # Move the last row into the hole to keep the matrix dense
+        last_id = self._ids.pop()
+        if last_id != zone_id:
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+            self._raw[row] = self._raw[-1]
+        self._raw = self._raw[:-1]
+
+    def _refresh_dirty(self):
+        dirty = list(self._dirty)
+        self._dirty.clear()
+
+        features = {}
+        for start in range(0, len(dirty), REFRESH_CHUNK_SIZE):
+            features.update(self._fetch(dirty[start:start + REFRESH_CHUNK_SIZE]))
+
+        new_rows = []
+        for zone_id in dirty:
+            vector = features.get(zone_id)
+            if vector is None:
+                self._remove(zone_id)
+            elif zone_id in self._rows:
+                self._raw[self._rows[zone_id]] = vector
+            else:
+                new_rows.append((zone_id, vector))
+
+        if new_rows:
+            for zone_id, _ in new_rows:
+                self._rows[zone_id] = len(self._ids)
+                self._ids.append(zone_id)
+            self._raw = np.vstack([self._raw, np.array([vector for _, vector in new_rows])])
+
+    def _normalize(self):
+        mean = self._raw.mean(axis=0)
+        std = self._raw.std(axis=0)
+        std[std == 0] = 1.0
+        scaled = (self._raw - mean) / std * FEATURE_WEIGHTS
+        norms = np.linalg.norm(scaled, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._matrix = scaled / norms
+
+    def _ensure_current(self):
+        if not self._loaded:
+            self._load()
+        elif self._dirty:
+            if len(self._dirty) > max(REFRESH_CHUNK_SIZE, FULL_RELOAD_FRACTION * len(self._ids)):
+                self._load()
+            else:
+                self._refresh_dirty()
+                self._matrix = None
+        if self._matrix is None and self._ids:
+            self._normalize()
+
+    def _mark_dirty(self, zone_ids):
+        with self._lock:
+            if self._loaded:
+                self._dirty.update(zone_id for zone_id in zone_ids if zone_id is not None)
+
+    def apply_zone_changes(self, changes):
+        """Apply committed zone changes from model_events"""
+        with self._lock:
+            if not self._loaded:
+                return  # first query will load the current tables
+            for op, row, _ in changes:
+                if op == 'delete':
+                    self._remove(row['id'])
+                    self._dirty.discard(row['id'])
+                    self._matrix = None
+                else:
+                    self._dirty.add(row['id'])
+
+    def apply_event_changes(self, changes):
+        """Mark zones whose event mix changed (including an event's old zone)"""
+        self._mark_dirty(
+            zone_id
+            for _, row, previous in changes
+            for zone_id in (row['zone_id'], previous.get('zone_id'))
+        )
+
+    def most_similar(self, zone_id, k=10):
+        """Return [(zone_id, similarity)] best first, or None for an unknown zone"""
+        with self._lock:
+            self._ensure_current()
+            row = self._rows.get(zone_id)
+            if row is None:
+                return None
+            matrix = self._matrix
+            ids = list(self._ids)
+
+        k = min(k, len(ids) - 1)
+        if k <= 0:
+            return []
+
+        scores = matrix @ matrix[row]
+        scores[row] = -np.inf  # never return the zone itself
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(ids[i], float(scores[i])) for i in top]
+
+zone_similarity = ZoneSimilarityIndex()
+model_events.subscribe(Zone, zone_similarity.apply_zone_changes)
+model_events.subscribe(Event, zone_similarity.apply_event_changes)
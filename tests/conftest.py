@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# The app creates its tables on import, so point it at a scratch database first
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='future-roi-tests-'), 'app.db')}"
+os.environ.pop('OPENAI_API_KEY', None)
+
+from src.main import app as flask_app
+from src.models.user import db
+from src.models.zone import Zone, Event
+from datetime import date
+
+@pytest.fixture
+def app():
+    with flask_app.app_context():
+        yield flask_app
+        db.session.rollback()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def count_statements(app):
+    """Context manager yielding a list that collects every SQL statement run inside it"""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+    return counter
+
+@pytest.fixture
+def make_zones(app):
+    """Create n zones (each with events_per_zone events) in city and return them"""
+    created = []
+
+    def make(n, city='Pune', events_per_zone=2):
+        start = db.session.query(db.func.coalesce(db.func.max(Zone.rank), 0)).scalar()
+        zones = []
+        for i in range(n):
+            zone = Zone(
+                country_code='IN', state='Maharashtra', city=city, name=f'{city} Zone {start + i + 1}',
+                rank=start + i + 1, outlook='HIGH', confidence='MEDIUM',
+                lat=18.5 + i * 0.01, lng=73.8 + i * 0.01
+            )
+            db.session.add(zone)
+            zones.append(zone)
+        db.session.flush()
+        for zone in zones:
+            for j in range(events_per_zone):
+                db.session.add(Event(
+                    zone_id=zone.id, type='INFRA', title=f'Metro phase {j}', description='New metro line',
+                    start_date=date(2026, 1, 1), expected_impact_bps=100 * (j + 1), status='ANNOUNCED'
+                ))
+        db.session.commit()
+        created.extend(zones)
+        return zones
+
+    yield make
+
+    for zone in created:
+        Event.query.filter_by(zone_id=zone.id).delete()
+        db.session.delete(zone)
+    db.session.commit()
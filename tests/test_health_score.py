@@ -0,0 +1,24 @@
+import pytest
+
+from src.models.investment import HealthScore
+from src.models.user import User, db
+
+@pytest.fixture
+def user(app):
+    user = User(username='health-user', email='health@example.com', monthly_income=60000, monthly_expenses=30000)
+    db.session.add(user)
+    db.session.commit()
+    yield user
+    db.session.rollback()
+    HealthScore.query.filter_by(user_id=user.id).delete()
+    db.session.delete(user)
+    db.session.commit()
+
+def test_computed_and_stored_scores_have_the_same_payload(client, user):
+    computed = client.get(f'/api/health-score/{user.id}').get_json()['data']
+    stored = client.get(f'/api/health-score/{user.id}').get_json()['data']
+
+    assert set(computed) == set(stored) == {'user_id', 'score', 'rating', 'factors', 'computed_at', 'recommendations'}
+    assert computed == stored
+    assert computed['user_id'] == user.id
+    assert computed['computed_at'] is not None
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+from src.models.user import db
+from src.services import llm_cache, llm_gateway
+from src.services.llm_cache import cache_get, cache_set, get_or_compute
+
+class FakeResponse(dict):
+    """Just enough of an openai ChatCompletion response for the gateway"""
+
+    def __init__(self, content, model):
+        super().__init__(model=model, usage={'total_tokens': 1})
+        self.choices = [type('Choice', (), {'message': type('Message', (), {'content': content})()})()]
+
+@pytest.fixture
+def llm_stub(app, monkeypatch):
+    """Replace the upstream call with a local stub recording every request"""
+    calls = []
+    delay = {'seconds': 0.0}
+
+    def create(**params):
+        calls.append(params)
+        time.sleep(delay['seconds'])
+        return FakeResponse(f"answer {len(calls)}", params['model'])
+
+    monkeypatch.setattr(llm_gateway.llm_client, 'create', create)
+    db.session.execute(llm_cache._table.delete())
+    db.session.commit()
+    yield calls, delay
+    db.session.execute(llm_cache._table.delete())
+    db.session.commit()
+
+def ask(content, **params):
+    return llm_gateway.chat_completion([{'role': 'user', 'content': content}], namespace='test', **params)
+
+def test_miss_then_hit(llm_stub):
+    calls, _ = llm_stub
+
+    first = ask('zone outlook?')
+    second = ask('zone outlook?')
+
+    assert first == second == 'answer 1'
+    assert len(calls) == 1
+
+def test_different_requests_miss(llm_stub):
+    calls, _ = llm_stub
+
+    assert ask('zone outlook?') != ask('zone outlook?', temperature=0.1)
+    assert len(calls) == 2
+
+def test_prompt_indentation_shares_the_entry(llm_stub):
+    calls, _ = llm_stub
+
+    ask('Analyze:\n    Pune')
+    ask('  Analyze:\n        Pune  ')
+
+    assert len(calls) == 1
+
+def test_expired_entries_are_recomputed(llm_stub):
+    calls, _ = llm_stub
+
+    ask('zone outlook?', ttl_seconds=0)
+    ask('zone outlook?', ttl_seconds=0)
+
+    assert len(calls) == 2
+
+def test_least_recently_used_entry_is_evicted(app, llm_stub, monkeypatch):
+    monkeypatch.setattr(llm_cache, 'MAX_ENTRIES', 2)
+
+    cache_set('a', 'test', {'value': 'a'})
+    time.sleep(0.01)
+    cache_set('b', 'test', {'value': 'b'})
+    time.sleep(0.01)
+    assert cache_get('a') == {'value': 'a'}  # a is now more recent than b
+    time.sleep(0.01)
+    cache_set('c', 'test', {'value': 'c'})
+
+    assert cache_get('b') is None
+    assert cache_get('a') == {'value': 'a'}
+    assert cache_get('c') == {'value': 'c'}
+
+def test_hits_do_not_write(app, llm_stub, count_statements):
+    cache_set('a', 'test', {'value': 'a'})
+
+    with count_statements() as statements:
+        for _ in range(5):
+            assert cache_get('a') == {'value': 'a'}
+
+    assert all(statement.lstrip().upper().startswith('SELECT') for statement in statements)
+
+def test_get_or_compute_stores_result(app, llm_stub):
+    computed = []
+
+    def compute():
+        computed.append(1)
+        return {'value': len(computed)}
+
+    assert get_or_compute('k', 'test', compute) == {'value': 1}
+    assert get_or_compute('k', 'test', compute) == {'value': 1}
+    assert len(computed) == 1
+
+def test_concurrent_identical_calls_are_coalesced(app, llm_stub):
+    calls, delay = llm_stub
+    delay['seconds'] = 0.3
+    before = llm_gateway.llm_single_flight.stats()['coalesced']
+    results = []
+
+    def worker():
+        with app.app_context():
+            results.append(ask('trending zones?'))
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ['answer 1'] * 10
+    assert llm_gateway.llm_single_flight.stats()['coalesced'] - before == 9
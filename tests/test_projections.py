@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from src.models.investment import Goal, Plan
+from src.models.user import User, db
+from src.services import projections
+
+@pytest.fixture
+def plan(app):
+    user = User(username='projection-user', email='projection@example.com')
+    db.session.add(user)
+    db.session.flush()
+    goal = Goal(user_id=user.id, type='WEALTH', target_amount=1000000, horizon_months=60)
+    db.session.add(goal)
+    db.session.flush()
+    plan = Plan(user_id=user.id, goal_id=goal.id, monthly_amount=10000,
+                allocation_json=json.dumps({'index_funds': 60, 'debt_funds': 40}))
+    db.session.add(plan)
+    db.session.commit()
+    yield plan
+    db.session.rollback()
+    for model in (Plan, Goal):
+        for row in model.query.filter_by(user_id=user.id):
+            db.session.delete(row)  # ORM delete so projections cascade
+    db.session.delete(user)
+    db.session.commit()
+
+def simulate(client, plan, **body):
+    return client.post(f'/api/plans/{plan.id}/projections', json=body)
+
+def test_projection_is_stored(client, plan):
+    response = simulate(client, plan, paths=500, seed=7)
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['plan_id'] == plan.id
+
+@pytest.mark.parametrize('body', [
+    {'paths': 'many'},
+    {'paths': 1.5},
+    {'paths': True},
+    {'seed': 'abc'},
+    {'seed': -1}
+])
+def test_invalid_parameters_are_rejected(client, plan, body):
+    response = simulate(client, plan, **body)
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_plan_without_goal_is_rejected(client, plan):
+    plan.goal_id = 999999
+    db.session.commit()
+
+    assert simulate(client, plan).status_code == 400
+
+def test_oversized_simulation_is_rejected(client, plan, monkeypatch):
+    monkeypatch.setattr(projections, 'MAX_PATH_MONTHS', 1000)
+    monkeypatch.setattr('src.routes.investments.MAX_PATH_MONTHS', 1000)
+
+    assert simulate(client, plan, paths=100).status_code == 400
+
+def create_plan(client, plan, **overrides):
+    body = {'user_id': plan.user_id, 'goal_id': plan.goal_id, 'monthly_amount': 10000, 'allocation': {'index_funds': 100}}
+    return client.post('/api/plans', json={**body, **overrides})
+
+def test_created_plan_is_simulated_within_the_size_limit(client, plan, monkeypatch):
+    monkeypatch.setattr(projections, 'MAX_PATH_MONTHS', 60 * 300)
+
+    response = create_plan(client, plan)
+
+    assert response.status_code == 200
+    stored = db.session.get(Plan, response.get_json()['data']['id'])
+    assumptions = json.loads(stored.projections[0].assumptions)
+    assert assumptions[0].startswith('Monte Carlo: 300 paths over 60 months')
+
+def test_created_plan_skips_simulation_beyond_the_size_limit(client, plan, monkeypatch):
+    monkeypatch.setattr(projections, 'MAX_PATH_MONTHS', 60 * 99)
+
+    response = create_plan(client, plan)
+
+    assert response.status_code == 200
+    assert db.session.get(Plan, response.get_json()['data']['id']).projections == []
+
+def test_non_numeric_allocation_is_rejected_before_saving(client, plan):
+    before = Plan.query.filter_by(user_id=plan.user_id).count()
+
+    response = create_plan(client, plan, allocation={'index_funds': 'sixty'})
+
+    assert response.status_code == 400
+    assert Plan.query.filter_by(user_id=plan.user_id).count() == before
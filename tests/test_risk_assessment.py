@@ -0,0 +1,55 @@
+import pytest
+
+from src.models.user import db
+from src.models.zone import Zone
+from src.routes.ai_services import perform_risk_assessment
+
+def assess(client, scenarios):
+    return client.post('/api/ai/risk-assessment/batch', json={'scenarios': scenarios})
+
+def test_batch_matches_scalar_assessment(client, make_zones):
+    medium_zone, low_zone = make_zones(2)
+    low_zone.confidence, low_zone.outlook = 'LOW', 'LOW'
+    db.session.commit()
+
+    scenarios = [
+        {'investment_type': 'stocks', 'amount': 100000, 'time_horizon': 24},
+        {'zone_id': str(medium_zone.id), 'user_profile': {'risk_profile': 'CONSERVATIVE'}},
+        {'zone_id': low_zone.id, 'investment_type': 'real_estate', 'amount': 6000000, 'time_horizon': 150,
+         'user_profile': {'risk_profile': 'CONSERVATIVE'}},
+        {'zone_id': low_zone.id, 'investment_type': 'sip', 'amount': 3000000, 'user_profile': {'risk_profile': 'GROWTH'}},
+        {'zone_id': 999999, 'investment_type': 'real_estate', 'amount': 2500000},
+        {'user_profile': None},
+        {}
+    ]
+
+    response = assess(client, scenarios)
+
+    assert response.status_code == 200
+    batch = response.get_json()['data']
+    assert len(batch) == len(scenarios)
+    for scenario, assessment in zip(scenarios, batch):
+        zone_id = scenario.get('zone_id')
+        expected = perform_risk_assessment(
+            scenario.get('investment_type', 'real_estate'),
+            scenario.get('amount', 1000000),
+            db.session.get(Zone, int(zone_id)) if zone_id else None,
+            scenario.get('time_horizon', 60),
+            scenario.get('user_profile') or {}
+        )
+        expected.pop('assessment_date')
+        assessment.pop('assessment_date')
+        assert assessment == expected, scenario
+
+@pytest.mark.parametrize('scenario', [
+    {'user_profile': 'CONSERVATIVE'},
+    {'user_profile': ['MODERATE']},
+    {'investment_type': ['stocks']},
+    {'zone_id': {'id': 1}},
+    {'amount': 'a lot'}
+])
+def test_batch_rejects_malformed_scenarios(client, scenario):
+    response = assess(client, [{'investment_type': 'sip'}, scenario])
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
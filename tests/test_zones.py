@@ -0,0 +1,117 @@
+import pytest
+
+from src.services.pagination import encode_cursor
+
+def list_zone_statements(client, count_statements, query=''):
+    with count_statements() as statements:
+        response = client.get(f'/api/zones{query}')
+    assert response.status_code == 200
+    return response.get_json(), len(statements)
+
+def test_zone_listing_statement_count_does_not_grow_with_zones(client, count_statements, make_zones):
+    make_zones(3)
+    small, small_count = list_zone_statements(client, count_statements)
+
+    make_zones(40)
+    large, large_count = list_zone_statements(client, count_statements)
+
+    assert large['count'] == small['count'] + 40
+    assert large_count == small_count
+
+def test_zone_listing_events_count(client, make_zones):
+    zone, = make_zones(1, events_per_zone=3)
+
+    data = client.get('/api/zones').get_json()['data']
+
+    assert {z['id']: z['events_count'] for z in data}[zone.id] == 3
+
+def test_city_filter_statement_count_does_not_grow_with_matches(client, count_statements, make_zones):
+    make_zones(2, city='Nagpur')
+    small, small_count = list_zone_statements(client, count_statements, '?city=Nagpur')
+
+    make_zones(30, city='Nagpur')
+    large, large_count = list_zone_statements(client, count_statements, '?city=Nagpur')
+
+    assert small['count'] == 2
+    assert large['count'] == 32
+    assert large_count == small_count
+
+def test_city_filter_matches_inside_the_listing_query(client, count_statements, make_zones):
+    make_zones(3, city='Nashik')
+    make_zones(2, city='Nagpur')
+
+    with count_statements() as statements:
+        response = client.get('/api/zones?city=Nashik')
+
+    assert {zone['city'] for zone in response.get_json()['data']} == {'Nashik'}
+    assert len(response.get_json()['data']) == 3
+    # the FTS match is a subquery of the listing, not a separate id lookup
+    fts_statements = [statement for statement in statements if 'zones_fts' in statement]
+    assert len(fts_statements) == 1 and 'FROM zones' in fts_statements[0]
+
+def test_roi_batch_accepts_numeric_string_ids(client, make_zones):
+    zone, = make_zones(1)
+
+    response = client.post('/api/zones/roi/batch', json={'zone_ids': [str(zone.id)], 'amount': '500000', 'horizons': ['36']})
+    batch = response.get_json()['data']
+    single = client.get(f'/api/zones/{zone.id}/roi?amount=500000&horizon=36').get_json()['data']
+
+    assert response.status_code == 200
+    assert batch['missing_zone_ids'] == []
+    assert batch['zone_ids'] == [zone.id]
+    assert batch['investment_amount'] == single['investment_amount'] == 500000
+    assert batch['future_value'][0][0][0] == single['future_value']
+
+@pytest.mark.parametrize('body', [
+    {'amount': 'ten lakh'},
+    {'amount': 1.5},
+    {'horizons': ['five years']},
+    {'horizons': [True]},
+    {'zone_ids': ['abc']},
+    {'zone_ids': 5},
+    {'types': [{'real_estate': 1}]}
+])
+def test_roi_batch_rejects_invalid_input(client, body):
+    response = client.post('/api/zones/roi/batch', json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+@pytest.mark.parametrize('query', ['?limit=0', '?limit=-1', '?limit=-3', '?limit=ten'])
+def test_zone_listing_rejects_invalid_limit(client, query):
+    response = client.get(f'/api/zones{query}')
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_zone_listing_caps_limit(client, make_zones, monkeypatch):
+    monkeypatch.setattr('src.services.pagination.MAX_PAGE_SIZE', 2)
+    make_zones(3)
+
+    body = client.get('/api/zones?limit=50').get_json()
+
+    assert body['count'] == 2
+    assert body['next_cursor'] is not None
+
+def test_zone_details_rejects_invalid_events_limit(client, make_zones):
+    zone, = make_zones(1)
+
+    assert client.get(f'/api/zones/{zone.id}?events_limit=-1').status_code == 400
+
+@pytest.mark.parametrize('values', [[{'a': 1}, 5], [1, '5'], [1, True], [None, 5], [1.5]])
+def test_tampered_cursor_is_rejected(client, values):
+    cursor = encode_cursor(*values)
+
+    response = client.get(f'/api/zones?limit=1&cursor={cursor}')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid cursor'
+
+def test_cursor_pages_through_zones(client, make_zones):
+    make_zones(3)
+    first = client.get('/api/zones?limit=2').get_json()
+
+    second = client.get(f"/api/zones?limit=2&cursor={first['next_cursor']}").get_json()
+
+    assert second['count'] >= 1
+    assert not {z['id'] for z in first['data']} & {z['id'] for z in second['data']}
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the AI routes, run offline against the fake OpenAI server.
+
+Drives the Flask app in-process (one test client per worker thread) on a
+throwaway copy of the database and reports throughput and p50/p95/p99 per
+route, plus how many calls reached the upstream. Example:
+
+    python tools/benchmark_ai_routes.py --requests 200 --concurrency 16 --latency-ms 600 --distinct 20
+
+Use --openai-base to benchmark against an already running fake server (or
+another endpoint) instead of the in-process one.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_openai_server import add_config_arguments, config_from_args, start_server
+
+SEARCH_QUERIES = [
+    'real estate in Pune under 80 lakh',
+    'where should I put money for my daughter college',
+    'safe gold investment for 5 years',
+    'something with good returns near the new airport',
+    'mutual funds in Bangalore between 10 lakh to 25 lakh',
+    'what is trending right now'
+]
+
+RISK_PROFILES = ['CONSERVATIVE', 'MODERATE', 'GROWTH']
+
+def route_specs(zones):
+    """route name -> (method, path builder, JSON body builder); builders take a variant index"""
+    def zone(i):
+        return zones[i % len(zones)]
+
+    return {
+        'ai_search': ('POST', lambda i: '/api/ai/search', lambda i: {
+            'query': f'{SEARCH_QUERIES[i % len(SEARCH_QUERIES)]} #{i}'
+        }),
+        'recommendations': ('POST', lambda i: '/api/recommendations', lambda i: {
+            'user_profile': {'risk_profile': RISK_PROFILES[i % 3], 'monthly_income': 50000 + 1000 * i},
+            'goal_data': {'type': 'WEALTH', 'target_amount': 1000000, 'horizon_months': 60},
+            'zone_id': zone(i)['id']
+        }),
+        'zone_analyze': ('POST', lambda i: f"/api/zones/{zone(i)['id']}/analyze", lambda i: None),
+        'smart_recommendations': ('POST', lambda i: '/api/ai/smart-recommendations', lambda i: {
+            'user_profile': {'risk_profile': RISK_PROFILES[i % 3], 'monthly_income': 50000 + 1000 * i},
+            'location_data': {'city': zone(i)['city']},
+            'investment_goals': {'type': 'WEALTH', 'target_amount': 2000000, 'horizon_months': 12 * (1 + i % 10)}
+        }),
+        'location_analysis': ('POST', lambda i: '/api/ai/location-analysis', lambda i: {
+            'latitude': zone(i)['lat'] + 0.05 * (i // len(zones)),
+            'longitude': zone(i)['lng'],
+            'radius': 25
+        }),
+        'market_insights': ('GET', lambda i: '/api/ai/market-insights', lambda i: None),
+        'risk_assessment': ('POST', lambda i: '/api/ai/risk-assessment', lambda i: {
+            'investment_type': ['real_estate', 'stocks', 'sip'][i % 3],
+            'amount': 500000 * (1 + i % 12),
+            'zone_id': zone(i)['id'],
+            'time_horizon': 12 * (1 + i % 15),
+            'user_profile': {'risk_profile': RISK_PROFILES[i % 3]}
+        })
+    }
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float('nan')
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+def run_route(app, method, path_for, body_for, requests, concurrency, distinct):
+    """Fire requests calls over concurrency threads; returns (latencies in s, errors, wall seconds)"""
+    local = threading.local()
+
+    def call(i):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        variant = i % distinct
+        body = body_for(variant)
+        started = time.perf_counter()
+        response = client.open(path_for(variant), method=method, json=body) if body is not None \
+            else client.open(path_for(variant), method=method)
+        elapsed = time.perf_counter() - started
+        payload = response.get_json(silent=True) or {}
+        return elapsed, response.status_code >= 400 or payload.get('success') is False
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(call, range(requests)))
+    wall = time.perf_counter() - started
+    return sorted(r[0] for r in results), sum(r[1] for r in results), wall
+
+def upstream_requests(openai_base):
+    try:
+        with urllib.request.urlopen(openai_base.rstrip('/') + '/stats', timeout=2) as response:
+            return json.load(response).get('requests')
+    except Exception:
+        return None  # not our fake server
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AI routes against a fake OpenAI server')
+    parser.add_argument('--routes', default='all', help='comma-separated route names (default: all)')
+    parser.add_argument('--requests', type=int, default=100, help='requests per route (default: 100)')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads (default: 8)')
+    parser.add_argument('--distinct', type=int, default=10,
+                        help='distinct payloads per route; fewer means more cache and coalescing hits')
+    parser.add_argument('--openai-base', help='use this API base instead of starting the fake server')
+    parser.add_argument('--database', default=os.path.join(ROOT, 'src', 'database', 'app.db'),
+                        help='database to copy for the run (the original is never written)')
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    openai_base = args.openai_base
+    if not openai_base:
+        _, openai_base = start_server(config_from_args(args))
+
+    workdir = tempfile.mkdtemp(prefix='ai-bench-')
+    database = os.path.join(workdir, 'app.db')
+    if os.path.exists(args.database):
+        shutil.copyfile(args.database, database)
+
+    # Settings are read at import time, so they must be in place before the app loads
+    os.environ['OPENAI_API_KEY'] = os.environ.get('OPENAI_API_KEY') or 'fake-key'
+    os.environ['OPENAI_API_BASE'] = openai_base
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+
+    from src.main import app
+    from src.models.zone import Zone
+    from src.services.llm_cache import cache_stats
+    from src.services.llm_client import llm_client
+    from src.services.llm_gateway import llm_single_flight
+
+    with app.app_context():
+        zones = [
+            {'id': z.id, 'lat': z.lat, 'lng': z.lng, 'city': z.city}
+            for z in Zone.query.order_by(Zone.rank) if z.lat is not None and z.lng is not None
+        ]
+    if not zones:
+        sys.exit('The database has no zones with coordinates; run seed_data.py first')
+
+    specs = route_specs(zones)
+    names = list(specs) if args.routes == 'all' else [name.strip() for name in args.routes.split(',')]
+    unknown = [name for name in names if name not in specs]
+    if unknown:
+        sys.exit(f"Unknown routes: {', '.join(unknown)} (choose from {', '.join(specs)})")
+
+    print(f'upstream {openai_base}, {args.requests} requests/route, concurrency {args.concurrency}, '
+          f'{args.distinct} distinct payloads')
+    header = f"{'route':<22}{'reqs':>6}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'upstream':>10}"
+    print(header)
+    print('-' * len(header))
+
+    try:
+        for name in names:
+            method, path_for, body_for = specs[name]
+            before = upstream_requests(openai_base)
+            latencies, errors, wall = run_route(
+                app, method, path_for, body_for, args.requests, args.concurrency, max(args.distinct, 1)
+            )
+            after = upstream_requests(openai_base)
+            upstream = after - before if before is not None and after is not None else '-'
+            ms = [value * 1000 for value in latencies]
+            print(f'{name:<22}{len(ms):>6}{errors:>8}{len(ms) / wall:>9.1f}{percentile(ms, 0.50):>9.1f}'
+                  f'{percentile(ms, 0.95):>9.1f}{percentile(ms, 0.99):>9.1f}{ms[-1]:>9.1f}{upstream:>10}')
+
+        metrics = llm_client.metrics()
+        coalescing = llm_single_flight.stats()
+        with app.app_context():
+            cache = cache_stats()
+        print()
+        print(f"llm client: {metrics['calls']} calls, {metrics['failed'] + metrics['timeouts']} failed, "
+              f"{metrics['rejected_open_circuit'] + metrics['rejected_queue_full']} rejected, "
+              f"breaker {metrics['breaker']['state']}, latency {metrics['latency_ms']}")
+        print(f"single-flight: {coalescing['executed']} executed, {coalescing['coalesced']} coalesced")
+        print(f"llm cache: {cache['hits']} hits, {cache['misses']} misses, {cache['entries']} entries")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI ChatCompletion API, for load tests without API credits.
+
+Point the backend at it with:
+    OPENAI_API_KEY=fake OPENAI_API_BASE=http://127.0.0.1:8765/v1 python src/main.py
+
+Responses are picked from canned replies by matching prompt text, after a
+delay drawn from the configured latency distribution; a share of requests
+fails with the configured HTTP status. GET /stats returns request counts.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# (substring of the prompt, reply content); first match wins, last entry is the default
+DEFAULT_RESPONSES = [
+    ('Return only valid JSON', json.dumps({
+        'location': 'Pune',
+        'investment_type': 'real_estate',
+        'budget_range': {'min': 5000000, 'max': 10000000},
+        'time_horizon': 60,
+        'risk_preference': 'MODERATE'
+    })),
+    ('portfolios array', json.dumps({
+        'portfolios': [
+            {
+                'name': 'Balanced Growth',
+                'allocation': {'index_funds': 40, 'flexi_cap': 25, 'debt_funds': 20, 'gold_etf': 15},
+                'rationale': ['Diversified core', 'Steady compounding', 'Downside buffer'],
+                'confidence': 'Medium'
+            }
+        ]
+    })),
+    ('', 'Growth drivers: infrastructure spending and job creation. '
+         'Risks: regulatory delays and price volatility. '
+         'Suitability: real estate Medium, stocks High, bonds Low.')
+]
+
+class FakeOpenAIConfig:
+    """Latency, failure and reply settings shared by all handler threads"""
+
+    def __init__(self, latency='lognormal', latency_ms=800.0, spread=0.5, error_rate=0.0,
+                 error_status=500, responses=None, seed=None):
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.spread = spread
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.responses = responses or DEFAULT_RESPONSES
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'by_model': {}}
+
+    def delay_seconds(self):
+        """Draw one response delay; latency_ms is the median (mean for normal/uniform)"""
+        with self._lock:
+            if self.latency == 'fixed':
+                ms = self.latency_ms
+            elif self.latency == 'uniform':
+                ms = self._random.uniform(self.latency_ms * (1 - self.spread), self.latency_ms * (1 + self.spread))
+            elif self.latency == 'normal':
+                ms = self._random.gauss(self.latency_ms, self.latency_ms * self.spread)
+            else:
+                ms = self._random.lognormvariate(0.0, self.spread) * self.latency_ms
+        return max(ms, 0.0) / 1000
+
+    def should_fail(self):
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def reply_for(self, messages):
+        text = '\n'.join(str(message.get('content', '')) for message in messages)
+        for pattern, content in self.responses:
+            if pattern in text:
+                return content
+        return self.responses[-1][1]
+
+    def record(self, model, failed):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['errors'] += int(failed)
+            self.stats['by_model'][model] = self.stats['by_model'].get(model, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self.stats))
+
+def make_handler(config):
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass  # keep benchmark output readable
+
+        def _send_json(self, status, body):
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path.rstrip('/').endswith('/stats'):
+                self._send_json(200, config.snapshot())
+            else:
+                self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self._send_json(400, {'error': {'message': 'Invalid JSON body', 'type': 'invalid_request_error'}})
+                return
+
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+                return
+
+            model = request.get('model', 'gpt-3.5-turbo')
+            time.sleep(config.delay_seconds())
+
+            if config.should_fail():
+                config.record(model, failed=True)
+                self._send_json(config.error_status, {
+                    'error': {'message': 'Simulated upstream failure', 'type': 'server_error'}
+                })
+                return
+
+            content = config.reply_for(request.get('messages') or [])
+            prompt_tokens = sum(len(str(m.get('content', '')).split()) for m in request.get('messages') or [])
+            completion_tokens = len(content.split())
+            config.record(model, failed=False)
+            self._send_json(200, {
+                'id': f'chatcmpl-{uuid.uuid4().hex[:24]}',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': content},
+                    'finish_reason': 'stop'
+                }],
+                'usage': {
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens
+                }
+            })
+
+    return FakeOpenAIHandler
+
+def start_server(config, host='127.0.0.1', port=0):
+    """Serve in a daemon thread; returns (server, base url ending in /v1)"""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fake-openai', daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}/v1'
+
+def load_responses(path):
+    """Canned replies from a JSON file: [{"match": "...", "content": "..." or {...}}, ...]"""
+    with open(path) as f:
+        entries = json.load(f)
+    responses = []
+    for entry in entries:
+        content = entry['content']
+        responses.append((entry.get('match', ''), content if isinstance(content, str) else json.dumps(content)))
+    return responses + [DEFAULT_RESPONSES[-1]]
+
+def add_config_arguments(parser):
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'normal', 'lognormal'], default='lognormal',
+                        help='response delay distribution (default: lognormal)')
+    parser.add_argument('--latency-ms', type=float, default=800.0, help='median delay in ms (default: 800)')
+    parser.add_argument('--spread', type=float, default=0.5,
+                        help='lognormal sigma, or relative width for uniform/normal (default: 0.5)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests that fail (0-1)')
+    parser.add_argument('--error-status', type=int, default=500, help='HTTP status of failed requests')
+    parser.add_argument('--responses', help='JSON file with canned replies')
+    parser.add_argument('--seed', type=int, help='random seed for delays and failures')
+
+def config_from_args(args):
+    return FakeOpenAIConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        spread=args.spread,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        responses=load_responses(args.responses) if args.responses else None,
+        seed=args.seed
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake OpenAI ChatCompletion server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config_from_args(args)))
+    server.daemon_threads = True
+    print(f'Fake OpenAI API on http://{args.host}:{args.port}/v1 ({args.latency}, median {args.latency_ms} ms, '
+          f'error rate {args.error_rate})')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()